@@ -0,0 +1,35 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+
+# Dedicated pool for blocking ffmpeg/ffprobe subprocess calls. Keeping them off
+# the loop's default executor stops a long encode from queueing unrelated work.
+FFMPEG_POOL = ThreadPoolExecutor(
+    max_workers=settings.ffmpeg_workers,
+    thread_name_prefix="ffmpeg",
+)
+
+# yt-dlp downloads are network bound and can run for minutes, so they get
+# their own threads rather than holding the default executor S3 calls use.
+# Sized to the download stage's concurrency, one thread per downloader.
+DOWNLOAD_POOL = ThreadPoolExecutor(
+    max_workers=settings.download_concurrency,
+    thread_name_prefix="ytdl",
+)
+
+# Installed as the event loop's default executor at startup, so it backs
+# asyncio.to_thread. What's left there is almost entirely blocking boto3
+# calls, which spend their time waiting on the network.
+S3_POOL = ThreadPoolExecutor(
+    max_workers=settings.s3_thread_pool,
+    thread_name_prefix="s3",
+)
+
+# Caps concurrent MP3 encodes across all services. Encoding is CPU bound, so
+# more parallel encodes than cores only adds contention; the remaining pool
+# threads stay free for short probes.
+FFMPEG_CONVERSION_SLOTS = asyncio.Semaphore(
+    max(1, min(os.cpu_count() or 1, settings.ffmpeg_concurrency)),
+)
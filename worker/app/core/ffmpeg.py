@@ -0,0 +1,52 @@
+import asyncio
+import os
+import shutil
+import subprocess
+
+from app.core.executors import FFMPEG_POOL
+
+# (path, mtime) of the ffmpeg binary that last ran `ffmpeg -version`
+# successfully in this process, and the version line it printed
+_ffmpeg_verified: tuple[str, float] | None = None
+ffmpeg_version: str | None = None
+
+
+async def ffmpeg_available() -> bool:
+    """Check that ffmpeg is installed and runs.
+
+    Health checks may be polled frequently, so the binary is only executed
+    once per installed build; later calls just stat it. Replacing or
+    upgrading the binary changes its mtime and triggers a fresh check.
+    """
+    global _ffmpeg_verified, ffmpeg_version
+
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path is None:
+        return False
+    try:
+        key = (ffmpeg_path, os.stat(ffmpeg_path).st_mtime)
+    except OSError:
+        return False
+    if _ffmpeg_verified == key:
+        return True
+
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(
+            FFMPEG_POOL,
+            lambda: subprocess.run(
+                [ffmpeg_path, "-version"],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            ),
+        )
+    except Exception:
+        return False
+
+    if result.returncode != 0:
+        _ffmpeg_verified = None
+        return False
+
+    _ffmpeg_verified = key
+    ffmpeg_version = result.stdout.partition("\n")[0] or None
+    return True
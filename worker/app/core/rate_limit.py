@@ -0,0 +1,27 @@
+import asyncio
+import time
+
+
+class HostRateLimiter:
+    """Space out requests to the same host across all tasks in the process.
+
+    Each host gets a schedule of evenly spaced start slots; `acquire` reserves
+    the next free slot and sleeps until it. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, per_minute: int):
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+
+    async def acquire(self, host: str) -> float:
+        """Wait for the host's next slot, returning the seconds waited"""
+        if not self._interval:
+            return 0.0
+
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
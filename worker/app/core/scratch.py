@@ -0,0 +1,22 @@
+import shutil
+
+from app.core.config import settings
+
+
+def scratch_dir(expected_size: int = 0) -> str | None:
+    """Return a RAM-backed directory for transient files if it has room.
+
+    Intermediate ffmpeg outputs are written once and read back immediately, so
+    keeping them on tmpfs avoids disk writes entirely. Returns None (use the
+    system temp dir) when TMPFS_DIR is unset, missing, or has less than twice
+    `expected_size` bytes free.
+    """
+    if not settings.tmpfs_dir:
+        return None
+    try:
+        free = shutil.disk_usage(settings.tmpfs_dir).free
+    except OSError:
+        return None
+    if free < expected_size * 2:
+        return None
+    return settings.tmpfs_dir
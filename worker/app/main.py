@@ -4,6 +4,7 @@ import sys
 from loguru import logger
 
 from app.core.config import settings
+from app.core.executors import S3_POOL
 from app.services.worker_service import WorkerService
 from app.services.database import engine
 
@@ -34,10 +35,20 @@ async def main():
         logger.error(f"❌ Database initialization failed: {str(e)}")
         sys.exit(1)
 
+    # Optional: without the trigger the worker just polls every interval
+    try:
+        from app.services.database import ensure_entry_notify_trigger
+
+        ensure_entry_notify_trigger()
+    except Exception as e:
+        logger.warning(f"Entry change notifications unavailable: {str(e)}")
+
     logger.info("Starting VoiceVault Worker")
     logger.info("Worker configuration:")
     logger.info(f"  - Mode: {settings.worker_mode.value.upper()}")
-    logger.info(f"  - Interval: {settings.worker_interval}s")
+    logger.info(
+        f"  - Interval: {settings.worker_interval_min}-{settings.worker_interval}s",
+    )
     logger.info(f"  - Batch size: {settings.batch_size}")
     logger.info(f"  - Download dir: {settings.download_dir}")
     logger.info(f"  - Supported domains: {', '.join(settings.supported_url_domains)}")
@@ -53,6 +64,10 @@ async def main():
             f"  - Cerebras API key: {'***configured***' if settings.cerebras_api_key else 'NOT SET'}",
         )
 
+    # asyncio.to_thread (all blocking S3 calls) runs on this pool; the
+    # built-in default of cpu_count + 4 threads is small for network waits
+    asyncio.get_running_loop().set_default_executor(S3_POOL)
+
     worker = WorkerService()
 
     # Handle shutdown signals
@@ -60,9 +75,11 @@ async def main():
         logger.info("Received shutdown signal")
         worker.stop()
 
-    # Register signal handlers
+    # Register signal handlers on the loop so stop() runs as a loop callback
+    # and wakes the worker out of its idle wait
+    loop = asyncio.get_running_loop()
     for sig in [signal.SIGINT, signal.SIGTERM]:
-        signal.signal(sig, lambda s, f: signal_handler())
+        loop.add_signal_handler(sig, signal_handler)
 
     try:
         await worker.start()
@@ -76,4 +93,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
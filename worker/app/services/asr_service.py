@@ -1,16 +1,67 @@
 import os
+import re
 import asyncio
 import subprocess
 from typing import Any
-from groq import Groq
+from groq import AsyncGroq
 import httpx
 from loguru import logger
 
 from app.core.config import settings, ASRProvider
-from app.services.s3_service import S3Service
+from app.core.executors import FFMPEG_POOL
+from app.core.rate_limit import HostRateLimiter
+from app.services.s3_service import S3NotFound, S3Service
 from app.services.audio_conversion_service import AudioConversionService
 from app.services.audio_chunking_service import AudioChunkingService
 
+# Compiled once so classifying an error is a single case-insensitive scan
+_PERMANENT_ERROR_RE = re.compile(
+    "|".join(
+        re.escape(pattern)
+        for pattern in (
+            "File not found",
+            "Unsupported file format",
+            "File too large for upload",  # Only permanent if it exceeds upload limit
+            "File too large for conversion",  # Only permanent if it exceeds conversion limit
+            "File is empty",
+            "File validation failed",
+            "Invalid API key",
+            "Unauthorized",
+            "authentication",
+            "invalid_request_error",
+            "invalid file format",
+            "unsupported media type",
+            "Failed to convert file to Groq-compatible format",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+# Validation errors that chunked transcription can get around
+_SIZE_ERROR_RE = re.compile(
+    r"too large|file size|groq processing|max:|exceeds|size limit"
+    r"|large file|chunk",
+    re.IGNORECASE,
+)
+# Standalone numbers of 1MB and up in error messages; digit runs touching a
+# word character or hyphen (UUIDs, keys) are not byte counts
+_BYTE_COUNT_RE = re.compile(r"(?<![\w-])\d{7,}(?![\w-])")
+
+
+def mentions_oversized_bytes(message: str) -> bool:
+    """Whether message quotes a byte count at or above the Groq chunk limit"""
+    return any(
+        int(count) >= settings.max_file_size
+        for count in _BYTE_COUNT_RE.findall(message)
+    )
+
+
+def is_size_error(message: str | None) -> bool:
+    """Whether a validation error is about size, which chunking can handle"""
+    return bool(message) and (
+        _SIZE_ERROR_RE.search(message) is not None or mentions_oversized_bytes(message)
+    )
+
 
 class ASRService:
     def __init__(self):
@@ -23,7 +74,7 @@ class ASRService:
         if self.provider == ASRProvider.GROQ:
             if not settings.groq_api_key:
                 raise ValueError("GROQ_API_KEY is required for Groq ASR service")
-            self.client = Groq(api_key=settings.groq_api_key)
+            self.client = AsyncGroq(api_key=settings.groq_api_key)
         elif self.provider == ASRProvider.WHISPER_ASR:
             self.whisper_asr_url = settings.whisper_asr_url
             logger.info(f"Using whisper-asr-webservice at {self.whisper_asr_url}")
@@ -36,6 +87,8 @@ class ASRService:
         self._s3_service = None
         self._audio_conversion_service = None
         self._audio_chunking_service = None
+        # Chunk requests start at least 0.5s apart, across all entries
+        self._chunk_pacer = HostRateLimiter(120)
 
     @property
     def s3_service(self):
@@ -58,11 +111,34 @@ class ASRService:
             self._audio_chunking_service = AudioChunkingService()
         return self._audio_chunking_service
 
+    async def warmup(self):
+        """Get the first entry's setup out of its way
+
+        Builds the lazily created S3, conversion and chunking services (the
+        S3 client checks its bucket) and, for Groq, opens the API connection
+        with a model listing. A failure only means the first entry starts cold.
+        """
+
+        try:
+            await asyncio.to_thread(
+                lambda: (
+                    self.s3_service,
+                    self.audio_conversion_service,
+                    self.audio_chunking_service,
+                ),
+            )
+            if self.provider == ASRProvider.GROQ:
+                await self.client.models.list()
+            logger.info("ASR service warmed up")
+        except Exception as e:
+            logger.warning(f"ASR warmup failed: {str(e)}")
+
     async def transcribe_file(
         self,
         s3_key: str,
         entry_id: str,
         language: str | None = None,
+        local_path: str | None = None,
     ) -> tuple[
         bool,
         str | None,
@@ -74,6 +150,9 @@ class ASRService:
         Transcribe audio/video file from S3 using the configured ASR provider.
         Handles large files by chunking them into smaller pieces.
 
+        Pass `local_path` from fetch_audio_file to reuse an already downloaded
+        copy; the caller then owns its cleanup.
+
         Returns:
             Tuple[success, transcript_text, words, segments, error_message]
 
@@ -83,28 +162,77 @@ class ASRService:
             not return that granularity.
         """
 
-        # Check if file exists in S3
-        if not self.s3_service.file_exists(s3_key):
-            error_msg = f"File not found in S3: {s3_key}"
-            logger.error(f"Entry {entry_id}: {error_msg}")
-            return False, None, None, None, error_msg
-
         # All files are now MP3 format (uploads are original, downloads are converted in download service)
-        transcription_s3_key = s3_key
         logger.info(
             f"Entry {entry_id}: Using file for transcription (already in MP3 format): {s3_key}",
         )
 
-        # Verify the file exists and get its info
-        if not self.s3_service.file_exists(transcription_s3_key):
-            error_msg = f"File not found in S3: {transcription_s3_key}"
+        if local_path is not None:
+            return await self._transcribe_local_file(
+                local_path,
+                entry_id,
+                language,
+            )
+
+        # Download file to temporary location; a missing object surfaces here
+        # instead of through a separate HEAD request
+        try:
+            temp_file_path = await asyncio.to_thread(
+                self.s3_service.create_temp_download,
+                s3_key,
+            )
+        except S3NotFound:
+            error_msg = f"File not found in S3: {s3_key}"
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, None, None, error_msg
+        if not temp_file_path:
+            error_msg = f"Failed to download file from S3: {s3_key}"
+            logger.error(f"Entry {entry_id}: {error_msg}")
+            return False, None, None, None, error_msg
+
+        try:
+            return await self._transcribe_local_file(
+                temp_file_path,
+                entry_id,
+                language,
+            )
+        finally:
+            # Clean up temporary file
+            self.s3_service.cleanup_temp_file(temp_file_path)
 
-        # Get file info for transcription
-        file_info = self.s3_service.get_file_info(transcription_s3_key)
-        file_size = file_info.get("size", 0) if file_info else 0
+    async def fetch_audio_file(self, s3_key: str) -> tuple[str | None, dict | None]:
+        """Download an entry's audio once for both validation and transcription
 
+        Returns (local_path, file_info). A missing object gives (None, {}) and
+        any other failure (None, None), so validation falls back to its own
+        HEAD and transcription to its own download.
+        """
+        try:
+            local_path = await asyncio.to_thread(
+                self.s3_service.create_temp_download,
+                s3_key,
+            )
+        except S3NotFound:
+            return None, {}
+        if not local_path:
+            return None, None
+        return local_path, {"size": os.path.getsize(local_path)}
+
+    async def _transcribe_local_file(
+        self,
+        temp_file_path: str,
+        entry_id: str,
+        language: str | None,
+    ) -> tuple[
+        bool,
+        str | None,
+        list[dict[str, Any]] | None,
+        list[dict[str, Any]] | None,
+        str | None,
+    ]:
+        """Transcribe a downloaded file, chunking it if the provider needs to"""
+
+        file_size = os.path.getsize(temp_file_path)
         logger.info(
             f"Entry {entry_id}: File size: {file_size} bytes ({file_size / (1024 * 1024):.1f} MB)",
         )
@@ -112,13 +240,6 @@ class ASRService:
             f"Entry {entry_id}: Groq chunk size limit: {settings.max_file_size} bytes ({settings.max_file_size / (1024 * 1024):.1f} MB)",
         )
 
-        # Download file to temporary location
-        temp_file_path = self.s3_service.create_temp_download(transcription_s3_key)
-        if not temp_file_path:
-            error_msg = f"Failed to download file from S3: {transcription_s3_key}"
-            logger.error(f"Entry {entry_id}: {error_msg}")
-            return False, None, None, None, error_msg
-
         try:
             if language:
                 logger.info(f"Entry {entry_id}: Forcing ASR language to '{language}'")
@@ -160,9 +281,6 @@ class ASRService:
             error_msg = f"Transcription error: {str(e)}"
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, None, None, error_msg
-        finally:
-            # Clean up temporary file
-            self.s3_service.cleanup_temp_file(temp_file_path)
 
     async def _transcribe_single_file(
         self,
@@ -197,13 +315,8 @@ class ASRService:
 
             logger.info(f"Entry {entry_id}: Starting single file transcription")
 
-            # Run transcription in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            transcript, words, segments = await loop.run_in_executor(
-                None,
-                self._transcribe_sync,
+            transcript, words, segments = await self._transcribe_one(
                 temp_file_path,
-                None,
                 entry_id,
                 language,
             )
@@ -274,22 +387,19 @@ class ASRService:
                     language,
                 )
 
+            concurrency = max(1, settings.asr_chunk_concurrency)
             logger.info(
-                f"Entry {entry_id}: Processing {len(chunk_paths)} chunks sequentially (multiple API calls to respect size limits)",
+                f"Entry {entry_id}: Processing {len(chunk_paths)} chunks, up to {concurrency} at a time (multiple API calls to respect size limits)",
             )
+            chunk_slots = asyncio.Semaphore(concurrency)
 
-            # Each chunk's timestamps are reset to 0 by ffmpeg, so we shift by
-            # the cumulative duration of preceding chunks to recover absolute
-            # positions in the original audio.
-            transcripts: list[str] = []
-            all_words: list[dict[str, Any]] = []
-            all_segments: list[dict[str, Any]] = []
-            cumulative_offset = 0.0
-            any_words_seen = False
-            any_segments_seen = False
+            async def transcribe_chunk(i: int, chunk_path: str):
+                """Return (duration, transcript, words, segments) for one chunk
 
-            for i, chunk_path in enumerate(chunk_paths):
-                try:
+                A chunk that is still too large to send comes back with only
+                its duration.
+                """
+                async with chunk_slots:
                     chunk_size = os.path.getsize(chunk_path)
                     logger.info(
                         f"Entry {entry_id}: Transcribing chunk {i + 1}/{len(chunk_paths)} (size: {chunk_size} bytes, limit: {settings.max_file_size} bytes)",
@@ -302,92 +412,94 @@ class ASRService:
                         logger.error(
                             f"Entry {entry_id}: Chunk {i + 1} is still too large: {chunk_size} bytes, skipping",
                         )
-                        if chunk_duration is not None:
-                            cumulative_offset += chunk_duration
-                        continue
+                        return chunk_duration, None, None, None
 
+                    # Space requests out to avoid rate limiting
+                    await self._chunk_pacer.acquire(self.provider.value)
                     logger.info(
-                        f"Entry {entry_id}: Sending chunk {i + 1}/{len(chunk_paths)} to Groq API (sequential processing)",
+                        f"Entry {entry_id}: Sending chunk {i + 1}/{len(chunk_paths)} to Groq API",
                     )
-
-                    # Run transcription in executor - SEQUENTIAL, not parallel
-                    loop = asyncio.get_event_loop()
-                    (
-                        chunk_transcript,
-                        chunk_words,
-                        chunk_segments,
-                    ) = await loop.run_in_executor(
-                        None,
-                        self._transcribe_sync,
+                    return chunk_duration, *await self._transcribe_one(
                         chunk_path,
-                        None,
                         f"{entry_id}_chunk_{i + 1}",
                         language,
                     )
 
-                    if chunk_transcript:
-                        transcripts.append(chunk_transcript.strip())
-                        logger.info(
-                            f"Entry {entry_id}: Chunk {i + 1}/{len(chunk_paths)} transcribed successfully "
-                            f"({len(chunk_transcript)} characters, {len(chunk_words) if chunk_words else 0} words, "
-                            f"{len(chunk_segments) if chunk_segments else 0} segments)",
-                        )
-                    else:
-                        logger.warning(
-                            f"Entry {entry_id}: Chunk {i + 1}/{len(chunk_paths)} returned empty transcript",
-                        )
-
-                    if chunk_words:
-                        any_words_seen = True
-                        for word in chunk_words:
-                            all_words.append(
-                                {
-                                    "word": word["word"],
-                                    "start": round(
-                                        word["start"] + cumulative_offset,
-                                        3,
-                                    ),
-                                    "end": round(word["end"] + cumulative_offset, 3),
-                                },
-                            )
-
-                    if chunk_segments:
-                        any_segments_seen = True
-                        for segment in chunk_segments:
-                            all_segments.append(
-                                {
-                                    "text": segment["text"],
-                                    "start": round(
-                                        segment["start"] + cumulative_offset,
-                                        3,
-                                    ),
-                                    "end": round(segment["end"] + cumulative_offset, 3),
-                                },
-                            )
-
-                    if chunk_duration is not None:
-                        cumulative_offset += chunk_duration
-                    elif chunk_words:
-                        # Fallback: advance offset to the last word's end so subsequent
-                        # chunks aren't stacked on top of this one if duration probing failed.
-                        cumulative_offset = max(cumulative_offset, all_words[-1]["end"])
-                    elif chunk_segments:
-                        cumulative_offset = max(
-                            cumulative_offset,
-                            all_segments[-1]["end"],
-                        )
+            results = await asyncio.gather(
+                *(
+                    transcribe_chunk(i, chunk_path)
+                    for i, chunk_path in enumerate(chunk_paths)
+                ),
+                return_exceptions=True,
+            )
 
-                    # Small delay between requests to avoid rate limiting
-                    if i < len(chunk_paths) - 1:  # Don't delay after the last chunk
-                        await asyncio.sleep(0.5)  # 500ms delay between API calls
+            # Each chunk's timestamps are reset to 0 by ffmpeg, so we shift by
+            # the cumulative duration of preceding chunks to recover absolute
+            # positions in the original audio. Results are merged in order
+            # once all chunks are done.
+            transcripts: list[str] = []
+            all_words: list[dict[str, Any]] = []
+            all_segments: list[dict[str, Any]] = []
+            cumulative_offset = 0.0
+            any_words_seen = False
+            any_segments_seen = False
 
-                except Exception as e:
+            for i, result in enumerate(results):
+                if isinstance(result, Exception):
                     logger.error(
-                        f"Entry {entry_id}: Error transcribing chunk {i + 1}: {str(e)}",
+                        f"Entry {entry_id}: Error transcribing chunk {i + 1}: {str(result)}",
                     )
                     # Continue with other chunks even if one fails
                     continue
 
+                chunk_duration, chunk_transcript, chunk_words, chunk_segments = result
+
+                if chunk_transcript:
+                    transcripts.append(chunk_transcript.strip())
+                    logger.info(
+                        f"Entry {entry_id}: Chunk {i + 1}/{len(chunk_paths)} transcribed successfully "
+                        f"({len(chunk_transcript)} characters, {len(chunk_words) if chunk_words else 0} words, "
+                        f"{len(chunk_segments) if chunk_segments else 0} segments)",
+                    )
+                else:
+                    logger.warning(
+                        f"Entry {entry_id}: Chunk {i + 1}/{len(chunk_paths)} returned empty transcript",
+                    )
+
+                if chunk_words:
+                    any_words_seen = True
+                    for word in chunk_words:
+                        all_words.append(
+                            {
+                                "word": word["word"],
+                                "start": round(word["start"] + cumulative_offset, 3),
+                                "end": round(word["end"] + cumulative_offset, 3),
+                            },
+                        )
+
+                if chunk_segments:
+                    any_segments_seen = True
+                    for segment in chunk_segments:
+                        all_segments.append(
+                            {
+                                "text": segment["text"],
+                                "start": round(segment["start"] + cumulative_offset, 3),
+                                "end": round(segment["end"] + cumulative_offset, 3),
+                            },
+                        )
+
+                if chunk_duration is not None:
+                    cumulative_offset += chunk_duration
+                elif chunk_words:
+                    # Fallback: advance offset to the last word's end so subsequent
+                    # chunks aren't stacked on top of this one if duration probing failed.
+                    cumulative_offset = max(cumulative_offset, all_words[-1]["end"])
+                elif chunk_segments:
+                    cumulative_offset = max(
+                        cumulative_offset,
+                        all_segments[-1]["end"],
+                    )
+
             if not transcripts:
                 return (
                     False,
@@ -426,9 +538,9 @@ class ASRService:
     async def _probe_audio_duration(file_path: str) -> float | None:
         """Return audio duration in seconds via ffprobe, or None on failure."""
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None,
+                FFMPEG_POOL,
                 lambda: subprocess.run(
                     [
                         "ffprobe",
@@ -451,14 +563,13 @@ class ASRService:
             logger.warning(f"ffprobe duration probe failed for {file_path}: {e}")
         return None
 
-    def _transcribe_sync(
+    async def _transcribe_one(
         self,
         file_path: str,
-        s3_key: str = None,
         entry_id: str = None,
         language: str | None = None,
     ) -> tuple[str | None, list[dict[str, Any]] | None, list[dict[str, Any]] | None]:
-        """Synchronous transcription returning (text, words, segments).
+        """Transcribe one file on the event loop, returning (text, words, segments).
 
         Each list element is a dict with timestamps in seconds rounded to
         millisecond precision. words have shape {"word", "start", "end"} and
@@ -467,9 +578,9 @@ class ASRService:
         639-1 code that forces detection; None means auto-detect.
         """
         if self.provider == ASRProvider.GROQ:
-            return self._transcribe_groq_sync(file_path, entry_id, language)
+            return await self._transcribe_groq(file_path, entry_id, language)
         elif self.provider == ASRProvider.WHISPER_ASR:
-            return self._transcribe_whisper_asr_sync(file_path, entry_id, language)
+            return await self._transcribe_whisper_asr(file_path, entry_id, language)
         else:
             raise ValueError(f"Unsupported ASR provider: {self.provider}")
 
@@ -511,13 +622,13 @@ class ASRService:
             "end": round(end, 3),
         }
 
-    def _transcribe_groq_sync(
+    async def _transcribe_groq(
         self,
         file_path: str,
         entry_id: str = None,
         language: str | None = None,
     ) -> tuple[str | None, list[dict[str, Any]] | None, list[dict[str, Any]] | None]:
-        """Synchronous Groq transcription with word-level timestamps"""
+        """Groq transcription with word-level timestamps via the async client"""
         try:
             # File is already in Groq-compatible format (MP3) after conversion
             file_size = os.path.getsize(file_path)
@@ -531,14 +642,26 @@ class ASRService:
 
                 # Check if 'file' command is available
                 if shutil.which("file"):
-                    result = subprocess.run(
-                        ["file", "-b", "--mime-type", file_path],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
+                    proc = await asyncio.create_subprocess_exec(
+                        "file",
+                        "-b",
+                        "--mime-type",
+                        file_path,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
                     )
-                    if result.returncode == 0:
-                        detected_type = result.stdout.strip()
+                    try:
+                        stdout, _ = await asyncio.wait_for(
+                            proc.communicate(),
+                            timeout=10,
+                        )
+                    except TimeoutError:
+                        # wait_for only cancels the read; reap the child too
+                        proc.kill()
+                        await proc.wait()
+                        raise
+                    if proc.returncode == 0:
+                        detected_type = stdout.decode(errors="replace").strip()
                         logger.info(
                             f"Entry {entry_id or 'unknown'}: Detected file type: {detected_type}",
                         )
@@ -575,7 +698,9 @@ class ASRService:
                 }
                 if language:
                     groq_kwargs["language"] = language
-                transcription = self.client.audio.transcriptions.create(**groq_kwargs)
+                transcription = await self.client.audio.transcriptions.create(
+                    **groq_kwargs,
+                )
 
                 text: str | None = None
                 raw_words: list[Any] = []
@@ -623,13 +748,13 @@ class ASRService:
             logger.error(f"Groq API error: {str(e)}")
             raise
 
-    def _transcribe_whisper_asr_sync(
+    async def _transcribe_whisper_asr(
         self,
         file_path: str,
         entry_id: str = None,
         language: str | None = None,
     ) -> tuple[str | None, list[dict[str, Any]] | None, list[dict[str, Any]] | None]:
-        """Synchronous whisper-asr-webservice transcription with word-level timestamps"""
+        """whisper-asr-webservice transcription with word-level timestamps"""
         try:
             file_size = os.path.getsize(file_path)
             logger.info(
@@ -652,12 +777,14 @@ class ASRService:
                     f"Entry {entry_id or 'unknown'}: Sending to whisper-asr-webservice at {self.whisper_asr_url}/asr",
                 )
 
-                response = httpx.post(
-                    f"{self.whisper_asr_url}/asr",
-                    files=files,
-                    params=params,
+                async with httpx.AsyncClient(
                     timeout=600.0,  # Long timeout for large files
-                )
+                ) as client:
+                    response = await client.post(
+                        f"{self.whisper_asr_url}/asr",
+                        files=files,
+                        params=params,
+                    )
                 response.raise_for_status()
 
                 try:
@@ -703,14 +830,22 @@ class ASRService:
             logger.error(f"whisper-asr-webservice error: {str(e)}")
             raise
 
-    def validate_audio_file(self, s3_key: str) -> tuple[bool, str | None]:
-        """Validate audio file in S3 for transcription - allows large files for chunking"""
+    def validate_audio_file(
+        self,
+        s3_key: str,
+        file_info: dict | None = None,
+    ) -> tuple[bool, str | None]:
+        """Validate audio file in S3 for transcription - allows large files for chunking
+
+        Pass `file_info` (e.g. from fetch_audio_file) to skip the S3 HEAD.
+        """
 
         try:
             logger.info(f"ASR validation starting for S3 key: {s3_key}")
 
             # Get file info for debugging
-            file_info = self.s3_service.get_file_info(s3_key)
+            if file_info is None:
+                file_info = self.s3_service.get_file_info(s3_key)
             if file_info:
                 file_size = file_info.get("size", 0)
                 logger.info(
@@ -728,36 +863,13 @@ class ASRService:
             logger.info(
                 "ASR validation - calling audio_conversion_service.validate_input_file",
             )
-            validation_success, validation_error = (
-                self.audio_conversion_service.validate_input_file(s3_key)
+            validation_success, validation_error, _ = (
+                self.audio_conversion_service.validate_input_file(s3_key, file_info)
             )
 
             if not validation_success:
                 # Check if this is a size-related error that we should ignore
-                size_related_keywords = [
-                    "too large",
-                    "file size",
-                    "groq processing",
-                    "max:",
-                    "bytes",
-                    "exceeds",
-                    "26214400",
-                    "34046591",
-                    "47700599",
-                    "file too large for groq",
-                    "file too large for groq processing",
-                    "(max:",
-                    "file too large for upload",
-                    "file too large for conversion",
-                    "size exceeds",
-                    "file size exceeds",
-                ]
-                is_size_error = validation_error and any(
-                    keyword in validation_error.lower()
-                    for keyword in size_related_keywords
-                )
-
-                if is_size_error:
+                if is_size_error(validation_error):
                     logger.warning(
                         f"ASR validation - ignoring size-related error (chunking will handle): {validation_error}",
                     )
@@ -794,26 +906,7 @@ class ASRService:
         if self.audio_conversion_service.is_permanent_error(error_message):
             return True
 
-        permanent_error_patterns = [
-            "File not found",
-            "Unsupported file format",
-            "File too large for upload",  # Only permanent if it exceeds upload limit
-            "File too large for conversion",  # Only permanent if it exceeds conversion limit
-            "File is empty",
-            "File validation failed",
-            "Invalid API key",
-            "Unauthorized",
-            "authentication",
-            "invalid_request_error",
-            "invalid file format",
-            "unsupported media type",
-            "Failed to convert file to Groq-compatible format",
-        ]
-
-        return any(
-            pattern.lower() in error_message.lower()
-            for pattern in permanent_error_patterns
-        )
+        return _PERMANENT_ERROR_RE.search(error_message) is not None
 
     async def health_check(self) -> bool:
         """Check if ASR provider, audio conversion, and chunking services are accessible"""
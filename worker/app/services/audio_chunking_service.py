@@ -5,6 +5,9 @@ import subprocess
 from loguru import logger
 
 from app.core.config import settings
+from app.core.executors import FFMPEG_POOL
+from app.core.ffmpeg import ffmpeg_available
+from app.core.scratch import scratch_dir
 
 
 class AudioChunkingService:
@@ -76,21 +79,24 @@ class AudioChunkingService:
             )
 
             # Create chunks
-            chunk_paths = await self._create_chunks(
+            chunks = await self._create_chunks(
                 input_file_path,
                 chunk_duration,
                 entry_id,
+                duration,
             )
 
-            if not chunk_paths:
+            if not chunks:
                 return False, [], "Failed to create audio chunks"
 
+            chunk_paths = [chunk_path for chunk_path, _ in chunks]
+
             # Verify all chunks are within size limits
-            oversized_chunks = []
-            for chunk_path in chunk_paths:
-                chunk_size = os.path.getsize(chunk_path)
-                if chunk_size > self.max_chunk_size:
-                    oversized_chunks.append((chunk_path, chunk_size))
+            oversized_chunks = [
+                (chunk_path, chunk_size)
+                for chunk_path, chunk_size in chunks
+                if chunk_size > self.max_chunk_size
+            ]
 
             if oversized_chunks:
                 # Clean up chunks
@@ -128,9 +134,9 @@ class AudioChunkingService:
                 file_path,
             ]
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None,
+                FFMPEG_POOL,
                 lambda: subprocess.run(cmd, capture_output=True, text=True, timeout=30),
             )
 
@@ -148,13 +154,19 @@ class AudioChunkingService:
         input_file_path: str,
         chunk_duration: float,
         entry_id: str,
-    ) -> list[str]:
-        """Create audio chunks using ffmpeg"""
-        chunk_paths = []
+        total_duration: float,
+    ) -> list[tuple[str, int]]:
+        """Create audio chunks using ffmpeg, returning (path, size) pairs"""
+        chunks = []
 
         try:
-            # Create temporary directory for chunks
-            temp_dir = tempfile.mkdtemp(prefix=f"chunks_{entry_id}_")
+            # Create temporary directory for chunks. Chunks are re-encoded at
+            # 128 kbps, so the whole set needs roughly duration * 16 KB.
+            expected_size = int(total_duration * 128_000 / 8)
+            temp_dir = tempfile.mkdtemp(
+                prefix=f"chunks_{entry_id}_",
+                dir=scratch_dir(expected_size),
+            )
 
             # Get the file extension
             _, ext = os.path.splitext(input_file_path)
@@ -166,6 +178,7 @@ class AudioChunkingService:
 
             cmd = [
                 "ffmpeg",
+                "-nostats",  # No per-second progress lines on stderr
                 "-i",
                 input_file_path,
                 "-f",
@@ -190,40 +203,51 @@ class AudioChunkingService:
 
             logger.info(f"Entry {entry_id}: Running ffmpeg command: {' '.join(cmd)}")
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None,
+                FFMPEG_POOL,
                 lambda: subprocess.run(
                     cmd,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     timeout=600,
                 ),  # 10 minute timeout
             )
 
             if result.returncode != 0:
+                # stderr stays bytes; only the tail, where FFmpeg reports the
+                # error, is decoded for the log
+                stderr_tail = result.stderr[-4096:].decode(errors="replace")
                 logger.error(
-                    f"Entry {entry_id}: ffmpeg chunking failed: {result.stderr}",
+                    f"Entry {entry_id}: ffmpeg chunking failed: {stderr_tail}",
                 )
                 return []
 
-            # Collect created chunk files
-            for i in range(1000):  # Safety limit
-                chunk_file = os.path.join(temp_dir, f"chunk_{i:03d}{ext}")
-                if os.path.exists(chunk_file):
-                    chunk_paths.append(chunk_file)
-                else:
-                    break
+            # Collect created chunk files and their sizes in a single directory
+            # scan, in playback order. The index is only padded to three
+            # digits, so chunk_1000 would sort before chunk_101 by name;
+            # order by the parsed number instead.
+            with os.scandir(temp_dir) as it:
+                indexed = sorted(
+                    (
+                        int(entry.name[len("chunk_") : -len(ext)]),
+                        entry.path,
+                        entry.stat().st_size,
+                    )
+                    for entry in it
+                    if entry.name.startswith("chunk_") and entry.name.endswith(ext)
+                )
+            chunks = [(path, size) for _, path, size in indexed]
 
             logger.info(
-                f"Entry {entry_id}: Created {len(chunk_paths)} chunks in {temp_dir}",
+                f"Entry {entry_id}: Created {len(chunks)} chunks in {temp_dir}",
             )
-            return chunk_paths
+            return chunks
 
         except Exception as e:
             logger.error(f"Entry {entry_id}: Error creating chunks: {str(e)}")
             # Clean up any partial chunks
-            for chunk_path in chunk_paths:
+            for chunk_path, _ in chunks:
                 try:
                     os.unlink(chunk_path)
                 except Exception:
@@ -250,16 +274,4 @@ class AudioChunkingService:
 
     async def health_check(self) -> bool:
         """Check if ffmpeg is available for chunking"""
-        try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    ["ffmpeg", "-version"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                ),
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return await ffmpeg_available()
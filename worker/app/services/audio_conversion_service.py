@@ -1,12 +1,255 @@
+import io
 import os
+import re
 import asyncio
 import subprocess
-import tempfile
+import threading
 from pathlib import Path
+from collections import deque
+from collections.abc import Callable
+from typing import IO, Any
 from loguru import logger
 
+try:
+    # Unix only; without it pipes keep the default buffer size
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    # Optional in-process encoder for short clips; FFmpeg is used without it
+    import av
+    import lameenc
+except ImportError:
+    av = None
+    lameenc = None
+
 from app.core.config import settings
-from app.services.s3_service import S3Service
+from app.core.executors import FFMPEG_CONVERSION_SLOTS, FFMPEG_POOL
+from app.core.ffmpeg import ffmpeg_available
+from app.services.s3_service import S3NotFound, S3Service
+
+# Containers that may keep their index at the end of the file; FFmpeg needs
+# a seekable input for these, so they can't be streamed through stdin
+SEEKABLE_INPUT_EXTENSIONS = frozenset({".mp4", ".m4a", ".mov"})
+
+# Read size when streaming S3 objects into FFmpeg
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Input formats FFmpeg can convert, in the order shown in error messages
+SUPPORTED_INPUT_FORMATS = (
+    ".mp3",
+    ".wav",
+    ".flac",
+    ".aac",
+    ".ogg",
+    ".wma",
+    ".m4a",
+    ".mp4",
+    ".avi",
+    ".mov",
+    ".mkv",
+    ".webm",
+    ".mpeg",
+    ".mpg",
+)
+SUPPORTED_INPUT_EXTENSIONS = frozenset(SUPPORTED_INPUT_FORMATS)
+
+GROQ_COMPATIBLE_FORMATS = (
+    ".flac",
+    ".mp3",
+    ".mp4",
+    ".mpeg",
+    ".mpga",
+    ".m4a",
+    ".ogg",
+    ".wav",
+    ".webm",
+)
+GROQ_COMPATIBLE_EXTENSIONS = frozenset(GROQ_COMPATIBLE_FORMATS)
+
+# Compiled once so classifying an error is a single case-insensitive scan
+_PERMANENT_ERROR_RE = re.compile(
+    "|".join(
+        re.escape(pattern)
+        for pattern in (
+            "File not found",
+            "Unsupported input format",
+            "File too large",
+            "File is empty",
+            "File validation failed",
+            "Invalid file format",
+            "file size exceeds",
+            "unsupported media type",
+            "corrupted file",
+            "invalid audio stream",
+            "no audio stream found",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+
+# Lines of FFmpeg stderr kept for error logs
+STDERR_TAIL_LINES = 256
+
+# Kernel buffer for the stdin/stdout pipes shared with FFmpeg. The 64KB
+# default means a context switch and a syscall on each side per 64KB moved;
+# matching the stream chunk size lets a whole chunk cross in one write.
+PIPE_BUFFER_SIZE = STREAM_CHUNK_SIZE
+
+
+def _grow_pipe(pipe: IO[bytes]) -> None:
+    """Enlarge a pipe's kernel buffer where supported (Linux only)"""
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except OSError:
+        # Above /proc/sys/fs/pipe-max-size for unprivileged users; keep default
+        pass
+
+
+# MPEG-1 Layer III bitrate (kbps) and sample rate tables, by header index
+_MPEG1_L3_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MPEG1_SAMPLE_RATES = (44100, 48000, 32000)
+
+
+def _probe_mp3_params(head: bytes) -> tuple[int, int, int] | None:
+    """(bitrate_kbps, sample_rate, channels) of a constant-bitrate MPEG-1 Layer III stream
+
+    Reads the first frame header after any ID3v2 tag. Returns None for other
+    MPEG versions/layers, free-format streams, or VBR files (Xing header),
+    since the first frame says nothing about the rest of those.
+    """
+    offset = _id3v2_tag_size(head)
+    header = head[offset : offset + 4]
+    if not _is_mp3_frame_header(header):
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    if version != 0x03 or layer != 0x01:
+        return None
+    bitrate = _MPEG1_L3_BITRATES[header[2] >> 4]
+    if not bitrate or b"Xing" in head[offset : offset + 64]:
+        return None
+    sample_rate = _MPEG1_SAMPLE_RATES[(header[2] >> 2) & 0x03]
+    channels = 1 if (header[3] >> 6) == 0x03 else 2
+    return bitrate, sample_rate, channels
+
+
+# Bytes read from the start of an input to detect its channel count
+CHANNEL_SNIFF_SIZE = 4096
+
+
+def _sniff_channels(head: bytes) -> int | None:
+    """Channel count from the header of a WAV, MP3, FLAC or Ogg stream
+
+    Returns None for other formats or if the header isn't in `head`.
+    """
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        offset = 12
+        while offset + 8 <= len(head):
+            chunk_id = head[offset : offset + 4]
+            chunk_size = int.from_bytes(head[offset + 4 : offset + 8], "little")
+            if chunk_id == b"fmt " and offset + 12 <= len(head):
+                return int.from_bytes(head[offset + 10 : offset + 12], "little")
+            offset += 8 + chunk_size + (chunk_size & 1)
+        return None
+    if head.startswith(b"fLaC") and len(head) >= 8 + 13:
+        # STREAMINFO follows the 4 byte block header; 3 bits of channels - 1
+        return ((head[8 + 12] >> 1) & 0x07) + 1
+    if head.startswith(b"OggS") and len(head) > 27:
+        packet = 27 + head[26]
+        if head[packet : packet + 7] == b"\x01vorbis" and len(head) > packet + 11:
+            return head[packet + 11]
+        if head[packet : packet + 8] == b"OpusHead" and len(head) > packet + 9:
+            return head[packet + 9]
+        return None
+    offset = _id3v2_tag_size(head)
+    header = head[offset : offset + 4]
+    if _is_mp3_frame_header(header):
+        # Channel mode 3 is single channel
+        return 1 if (header[3] >> 6) == 0x03 else 2
+    return None
+
+
+class _PrefixedStream:
+    """Read-only stream yielding already-read bytes before the rest of a body"""
+
+    def __init__(self, prefix: bytes, stream: Any):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b""
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
+
+
+class _UploadAborted(Exception):
+    """Raised from the stdout sink when the streamed upload fails"""
+
+
+class _OutputTap:
+    """Read-only wrapper recording the size and first bytes of a stream"""
+
+    def __init__(self, stream: IO[bytes], head_size: int = 4096):
+        self._stream = stream
+        self._head_size = head_size
+        self.head = b""
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if len(self.head) < self._head_size:
+            self.head += data[: self._head_size - len(self.head)]
+        self.size += len(data)
+        return data
+
+
+def _id3v2_tag_size(header: bytes) -> int:
+    """Total size of a leading ID3v2 tag, or 0 if the data doesn't start with one"""
+    if len(header) < 10 or not header.startswith(b"ID3"):
+        return 0
+    # Tag size is a 28-bit syncsafe integer (7 bits per byte)
+    size = (
+        ((header[6] & 0x7F) << 21)
+        | ((header[7] & 0x7F) << 14)
+        | ((header[8] & 0x7F) << 7)
+        | (header[9] & 0x7F)
+    )
+    # 10 byte header, plus a 10 byte footer if the footer flag is set
+    return size + (20 if header[5] & 0x10 else 10)
+
+
+def _is_mp3_frame_header(header: bytes) -> bool:
+    """Check frame sync and non-reserved version/layer/bitrate/sample-rate bits"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return False
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    return (
+        version != 0x01
+        and layer != 0x00
+        and bitrate_index != 0x0F
+        and sample_rate_index != 0x03
+    )
+
+
+def _looks_like_mp3(head: bytes) -> bool:
+    """Check the first bytes of a stream for a valid MP3 frame header"""
+    offset = _id3v2_tag_size(head)
+    if offset + 4 > len(head) and offset:
+        # Tag runs past the captured bytes; the ID3 header is all we can check
+        return True
+    return _is_mp3_frame_header(head[offset : offset + 4])
 
 
 class AudioConversionService:
@@ -14,6 +257,7 @@ class AudioConversionService:
         self.s3_service = S3Service()
         self.target_format = "mp3"
         self.target_bitrate = "128k"
+        self.mono_bitrate = "64k"
         self.target_sample_rate = "44100"
 
     async def convert_local_to_mp3_and_upload(
@@ -39,64 +283,79 @@ class AudioConversionService:
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, error_msg
 
-        # Create temporary output file for MP3
-        temp_output_path = None
+        s3_key = self.s3_service.generate_s3_key(entry_id, f"{entry_id}.mp3")
+        logger.info(
+            f"Entry {entry_id}: Converting local file to MP3: {local_file_path}",
+        )
 
         try:
-            # Create temporary output file
-            temp_output_fd, temp_output_path = tempfile.mkstemp(suffix=".mp3")
-            os.close(temp_output_fd)  # Close file descriptor, we'll use the path
-
-            logger.info(
-                f"Entry {entry_id}: Converting local file to MP3: {local_file_path}",
-            )
-
-            # Perform conversion
-            loop = asyncio.get_event_loop()
-            conversion_success = await loop.run_in_executor(
-                None,
-                self._convert_to_mp3_sync,
-                local_file_path,
-                temp_output_path,
-                entry_id,
-            )
+            # FFmpeg's stdout goes straight into a multipart upload, so the
+            # MP3 is never written to local disk and read back
+            loop = asyncio.get_running_loop()
+            async with FFMPEG_CONVERSION_SLOTS:
+                error_msg = await loop.run_in_executor(
+                    FFMPEG_POOL,
+                    self._convert_to_mp3_and_upload_sync,
+                    local_file_path,
+                    s3_key,
+                    entry_id,
+                )
+        except Exception as e:
+            error_msg = f"Error during local file conversion: {str(e)}"
 
-            if not conversion_success:
-                return False, None, "Audio conversion to MP3 failed"
+        if error_msg:
+            logger.error(f"Entry {entry_id}: {error_msg}")
+            return False, None, error_msg
 
-            # Generate S3 key for MP3 file
-            mp3_filename = f"{entry_id}.mp3"
-            s3_key = self.s3_service.generate_s3_key(entry_id, mp3_filename)
+        logger.info(
+            f"Entry {entry_id}: Successfully converted and uploaded to S3: {s3_key}",
+        )
+        return True, s3_key, None
 
-            # Upload converted MP3 to S3
-            upload_success = self.s3_service.upload_file_from_path(
-                temp_output_path,
-                s3_key,
-                content_type="audio/mpeg",
-            )
+    async def convert_stream_to_mp3_and_upload(
+        self,
+        input_stream: IO[bytes],
+        entry_id: str,
+        input_size: int | None = None,
+    ) -> tuple[bool, str | None, str | None]:
+        """
+        Convert a non-seekable input stream to MP3 and upload to S3
+        Used by download service to convert HTTP downloads without a local file
 
-            if not upload_success:
-                error_msg = f"Failed to upload converted MP3 to S3: {s3_key}"
-                logger.error(f"Entry {entry_id}: {error_msg}")
-                return False, None, error_msg
+        Args:
+            input_stream: Readable stream, fed to FFmpeg's stdin as it is read
+            entry_id: Entry ID for generating S3 key
+            input_size: Stream length in bytes, if known
 
-            logger.info(
-                f"Entry {entry_id}: Successfully converted and uploaded to S3: {s3_key}",
-            )
-            return True, s3_key, None
+        Returns:
+            Tuple[success, s3_key, error_message]
+        """
+        s3_key = self.s3_service.generate_s3_key(entry_id, f"{entry_id}.mp3")
+        logger.info(f"Entry {entry_id}: Converting streamed input to MP3")
 
+        try:
+            loop = asyncio.get_running_loop()
+            async with FFMPEG_CONVERSION_SLOTS:
+                error_msg = await loop.run_in_executor(
+                    FFMPEG_POOL,
+                    self._convert_to_mp3_and_upload_sync,
+                    "pipe:0",
+                    s3_key,
+                    entry_id,
+                    input_stream,
+                    input_size,
+                )
         except Exception as e:
-            error_msg = f"Error during local file conversion: {str(e)}"
+            error_msg = f"Error during stream conversion: {str(e)}"
+
+        if error_msg:
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, error_msg
 
-        finally:
-            # Clean up temporary output file
-            if temp_output_path and os.path.exists(temp_output_path):
-                try:
-                    os.unlink(temp_output_path)
-                except Exception:
-                    pass
+        logger.info(
+            f"Entry {entry_id}: Successfully converted and uploaded to S3: {s3_key}",
+        )
+        return True, s3_key, None
 
     async def convert_to_mp3(
         self,
@@ -115,56 +374,62 @@ class AudioConversionService:
             Tuple[success, output_s3_key, error_message]
         """
 
-        # Check if file exists in S3
-        if not self.s3_service.file_exists(input_s3_key):
-            error_msg = f"Input file not found in S3: {input_s3_key}"
-            logger.error(f"Entry {entry_id}: {error_msg}")
-            return False, None, error_msg
-
         # Always convert to ensure proper MP3 format for Groq
         # Even if the file extension is .mp3, it might not be in the correct format
         logger.info(f"Entry {entry_id}: Converting to MP3 format: {input_s3_key}")
 
-        # Download input file to temporary location
-        temp_input_path = self.s3_service.create_temp_download(input_s3_key)
-        if not temp_input_path:
+        # S3 calls below run in the default executor via to_thread, so they
+        # neither block the loop nor take FFmpeg pool threads
+
+        # Stream the object straight into FFmpeg's stdin so the S3 download
+        # overlaps with encoding. MP4-family containers may store their index
+        # at the end of the file and need a seekable input, so those are still
+        # downloaded to a temporary file first.
+        temp_input_path = None
+        input_stream = None
+        input_size = None
+        try:
+            if Path(input_s3_key).suffix.lower() in SEEKABLE_INPUT_EXTENSIONS:
+                temp_input_path = await asyncio.to_thread(
+                    self.s3_service.create_temp_download,
+                    input_s3_key,
+                )
+            else:
+                input_stream, input_size = await asyncio.to_thread(
+                    self.s3_service.open_object_stream,
+                    input_s3_key,
+                )
+        except S3NotFound:
+            error_msg = f"Input file not found in S3: {input_s3_key}"
+            logger.error(f"Entry {entry_id}: {error_msg}")
+            return False, None, error_msg
+        except Exception as e:
+            logger.error(f"Entry {entry_id}: Failed to open S3 object: {str(e)}")
+        if not temp_input_path and input_stream is None:
             error_msg = f"Failed to download input file from S3: {input_s3_key}"
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, error_msg
 
-        try:
-            # Generate output file path
-            temp_output_fd, temp_output_path = tempfile.mkstemp(suffix=".mp3")
-            os.close(temp_output_fd)
-
-            # Run conversion in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            conversion_success = await loop.run_in_executor(
-                None,
-                self._convert_to_mp3_sync,
-                temp_input_path,
-                temp_output_path,
-                entry_id,
-            )
+        # Generate output S3 key
+        output_filename = f"{entry_id}.mp3"
+        output_s3_key = self.s3_service.generate_s3_key(entry_id, output_filename)
 
-            if not conversion_success:
-                error_msg = "Audio conversion to MP3 failed"
-                logger.error(f"Entry {entry_id}: {error_msg}")
-                return False, None, error_msg
-
-            # Generate output S3 key
-            output_filename = f"{entry_id}.mp3"
-            output_s3_key = self.s3_service.generate_s3_key(entry_id, output_filename)
-
-            # Upload converted file to S3
-            upload_success = self.s3_service.upload_file_from_path(
-                temp_output_path,
-                output_s3_key,
-                content_type="audio/mpeg",
-            )
+        try:
+            # Encode and upload in executor to avoid blocking; FFmpeg's stdout
+            # goes straight into a multipart upload without a temp file
+            loop = asyncio.get_running_loop()
+            async with FFMPEG_CONVERSION_SLOTS:
+                error_msg = await loop.run_in_executor(
+                    FFMPEG_POOL,
+                    self._convert_to_mp3_and_upload_sync,
+                    temp_input_path or "pipe:0",
+                    output_s3_key,
+                    entry_id,
+                    input_stream,
+                    input_size,
+                )
 
-            if not upload_success:
-                error_msg = f"Failed to upload converted MP3 to S3: {output_s3_key}"
+            if error_msg:
                 logger.error(f"Entry {entry_id}: {error_msg}")
                 return False, None, error_msg
 
@@ -178,239 +443,391 @@ class AudioConversionService:
             logger.error(f"Entry {entry_id}: {error_msg}")
             return False, None, error_msg
         finally:
-            # Clean up temporary files
-            self.s3_service.cleanup_temp_file(temp_input_path)
-            if "temp_output_path" in locals() and os.path.exists(temp_output_path):
-                try:
-                    os.unlink(temp_output_path)
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup temp output file: {str(e)}")
-
-    def _convert_to_mp3_sync(
+            # Clean up temporary input
+            if temp_input_path:
+                self.s3_service.cleanup_temp_file(temp_input_path)
+            if input_stream is not None:
+                input_stream.close()
+
+    def _is_target_mp3(self, head: bytes) -> bool:
+        """Check whether an input is already a CBR MP3 in the output format"""
+        params = _probe_mp3_params(head)
+        if params is None:
+            return False
+        bitrate, sample_rate, channels = params
+        target_bitrate = self.mono_bitrate if channels == 1 else self.target_bitrate
+        return (
+            f"{bitrate}k" == target_bitrate
+            and str(sample_rate) == self.target_sample_rate
+        )
+
+    def _encode_mp3_in_process(
         self,
-        input_path: str,
-        output_path: str,
+        source: str | IO[bytes],
         entry_id: str,
-    ) -> bool:
-        """Synchronous MP3 conversion using FFmpeg"""
+    ) -> bytes | None:
+        """Decode with PyAV and encode MP3 with LAME, skipping the FFmpeg fork
 
+        Produces the same 44.1kHz output and channel/bitrate choice as the
+        FFmpeg command.
+        Returns None if the input can't be decoded this way.
+        """
         try:
-            # FFmpeg command for MP3 conversion with explicit format
-            cmd = [
-                "ffmpeg",
-                "-i",
-                input_path,
-                "-vn",  # No video
+            output = bytearray()
+            with av.open(source) as container:
+                if not container.streams.audio:
+                    return None
+                stream = container.streams.audio[0]
+                channels = 1 if stream.codec_context.channels == 1 else 2
+                bitrate = self.mono_bitrate if channels == 1 else self.target_bitrate
+
+                encoder = lameenc.Encoder()
+                encoder.set_bit_rate(int(bitrate.rstrip("k")))
+                encoder.set_in_sample_rate(int(self.target_sample_rate))
+                encoder.set_channels(channels)
+                encoder.set_quality(2)
+                resampler = av.AudioResampler(
+                    format="s16",
+                    layout="mono" if channels == 1 else "stereo",
+                    rate=int(self.target_sample_rate),
+                )
+                # Packed s16: 2 bytes per sample per channel; the plane
+                # buffer may be padded past the last sample
+                frame_bytes = 2 * channels
+
+                for frame in container.decode(stream):
+                    for pcm in resampler.resample(frame):
+                        output += encoder.encode(
+                            bytes(pcm.planes[0])[: pcm.samples * frame_bytes],
+                        )
+                for pcm in resampler.resample(None):
+                    output += encoder.encode(
+                        bytes(pcm.planes[0])[: pcm.samples * frame_bytes],
+                    )
+            output += encoder.flush()
+        except Exception as e:
+            logger.debug(
+                f"Entry {entry_id}: In-process conversion failed, using FFmpeg: {str(e)}",
+            )
+            return None
+
+        if not _looks_like_mp3(bytes(output[:4096])):
+            return None
+        return bytes(output)
+
+    def _build_mp3_command(
+        self,
+        input_path: str,
+        output_path: str,
+        channels: int | None = None,
+        copy_audio: bool = False,
+    ) -> list[str]:
+        """FFmpeg command for MP3 conversion with explicit format
+
+        Mono inputs stay mono at a lower bitrate; upmixing speech to stereo
+        doubles the encoder's work and the output size for no gain. With
+        `copy_audio` the MP3 stream is remuxed as-is instead of re-encoded.
+        """
+        mono = channels == 1
+        if copy_audio:
+            codec_args = ["-c:a", "copy"]  # Already in the target format
+        else:
+            codec_args = [
                 "-acodec",
                 "libmp3lame",  # Use LAME MP3 encoder
                 "-ab",
-                self.target_bitrate,  # Audio bitrate
+                self.mono_bitrate if mono else self.target_bitrate,  # Audio bitrate
                 "-ar",
                 self.target_sample_rate,  # Sample rate
                 "-ac",
-                "2",  # Stereo
-                "-f",
-                "mp3",  # Force MP3 format
-                "-y",  # Overwrite output file
-                output_path,
+                "1" if mono else "2",  # Mono stays mono, everything else stereo
             ]
+        return [
+            "ffmpeg",
+            "-nostats",  # No per-second progress lines on stderr
+            "-i",
+            input_path,
+            "-vn",  # No video
+            "-threads",
+            "1",  # Parallelism comes from concurrent encodes, not threads
+            *codec_args,
+            "-f",
+            "mp3",  # Force MP3 format
+            "-y",  # Overwrite output file
+            output_path,
+        ]
 
-            logger.info(
-                f"Entry {entry_id}: Converting to MP3: {input_path} -> {output_path}",
+    def _convert_to_mp3_and_upload_sync(
+        self,
+        input_path: str,
+        output_s3_key: str,
+        entry_id: str,
+        input_stream: Any | None = None,
+        input_size: int | None = None,
+    ) -> str | None:
+        """Encode to MP3 and stream FFmpeg's stdout into an S3 upload
+
+        Inputs smaller than settings.pyav_threshold are first tried with the
+        in-process encoder. Returns None on success or an error message. A
+        partially uploaded object is deleted if FFmpeg fails or the output
+        doesn't look like MP3.
+        """
+        if input_stream is not None:
+            head = input_stream.read(CHANNEL_SNIFF_SIZE)
+            input_stream = _PrefixedStream(head, input_stream)
+        else:
+            with open(input_path, "rb") as f:
+                head = f.read(CHANNEL_SNIFF_SIZE)
+        channels = _sniff_channels(head)
+        copy_audio = self._is_target_mp3(head)
+
+        if input_size is None and input_stream is None:
+            input_size = os.path.getsize(input_path)
+        if av is not None and input_size is not None and not copy_audio:
+            if 0 < input_size < settings.pyav_threshold:
+                if input_stream is not None:
+                    # Small enough to hold in memory; FFmpeg can reuse the
+                    # buffer if in-process decoding fails
+                    input_stream = io.BytesIO(input_stream.read())
+                mp3_data = self._encode_mp3_in_process(
+                    input_stream if input_stream is not None else input_path,
+                    entry_id,
+                )
+                if mp3_data is not None:
+                    if not self.s3_service.upload_file(
+                        io.BytesIO(mp3_data),
+                        output_s3_key,
+                        content_type="audio/mpeg",
+                    ):
+                        return f"Failed to upload converted MP3 to S3: {output_s3_key}"
+                    logger.info(
+                        f"Entry {entry_id}: MP3 conversion successful (in-process). Output size: {len(mp3_data)} bytes",
+                    )
+                    return None
+                if input_stream is not None:
+                    input_stream.seek(0)
+
+        cmd = self._build_mp3_command(input_path, "pipe:1", channels, copy_audio)
+        logger.info(
+            f"Entry {entry_id}: Converting to MP3: {input_path} -> s3://{output_s3_key}",
+        )
+        logger.debug(f"Entry {entry_id}: FFmpeg command: {' '.join(cmd)}")
+
+        upload_result: dict[str, Any] = {}
+
+        def upload_stdout(stdout):
+            tap = _OutputTap(stdout)
+            upload_result["tap"] = tap
+            upload_result["ok"] = self.s3_service.upload_file(
+                tap,
+                output_s3_key,
+                content_type="audio/mpeg",
             )
-            logger.debug(f"Entry {entry_id}: FFmpeg command: {' '.join(cmd)}")
+            if not upload_result["ok"]:
+                # Nothing is reading stdout any more; stop FFmpeg
+                raise _UploadAborted
 
-            # Run FFmpeg
-            result = subprocess.run(
+        try:
+            returncode, stderr = self._run_ffmpeg(
                 cmd,
-                capture_output=True,
-                text=True,
+                entry_id,
+                input_stream=input_stream,
+                stdout_sink=upload_stdout,
                 timeout=600,  # 10 minute timeout
             )
+        except subprocess.TimeoutExpired:
+            self.s3_service.delete_file(output_s3_key)
+            return "FFmpeg timed out during MP3 conversion"
+        except _UploadAborted:
+            return f"Failed to upload converted MP3 to S3: {output_s3_key}"
+
+        tap = upload_result.get("tap")
+        if returncode != 0:
+            logger.error(
+                f"Entry {entry_id}: FFmpeg failed with return code {returncode}",
+            )
+            logger.error(f"Entry {entry_id}: FFmpeg stderr: {stderr}")
+            error_msg = "Audio conversion to MP3 failed"
+        elif not tap or tap.size == 0:
+            error_msg = "FFmpeg completed but output is empty"
+        elif not _looks_like_mp3(tap.head):
+            error_msg = "MP3 conversion produced invalid file"
+        else:
+            logger.info(
+                f"Entry {entry_id}: MP3 conversion successful. Output size: {tap.size} bytes",
+            )
+            return None
 
-            if result.returncode == 0:
-                # Check if output file exists and has content
-                if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                    file_size = os.path.getsize(output_path)
+        self.s3_service.delete_file(output_s3_key)
+        return error_msg
 
-                    # Verify the output is actually a valid MP3 file
-                    if self._verify_mp3_file(output_path, entry_id):
-                        logger.info(
-                            f"Entry {entry_id}: MP3 conversion successful. Output size: {file_size} bytes",
-                        )
-                        return True
-                    else:
-                        logger.error(
-                            f"Entry {entry_id}: MP3 conversion produced invalid file",
-                        )
-                        return False
-                else:
-                    logger.error(
-                        f"Entry {entry_id}: FFmpeg completed but output file is empty",
-                    )
-                    return False
-            else:
-                logger.error(
-                    f"Entry {entry_id}: FFmpeg failed with return code {result.returncode}",
-                )
-                logger.error(f"Entry {entry_id}: FFmpeg stderr: {result.stderr}")
-                logger.error(f"Entry {entry_id}: FFmpeg stdout: {result.stdout}")
-                return False
+    def _run_ffmpeg(
+        self,
+        cmd: list[str],
+        entry_id: str,
+        input_stream: Any | None = None,
+        stdout_sink: Callable[[IO[bytes]], None] | None = None,
+        timeout: float = 600,
+    ) -> tuple[int, str]:
+        """Run FFmpeg to completion and return (returncode, stderr)
+
+        If `input_stream` is given it is fed to stdin from a helper thread, so
+        FFmpeg starts encoding while the rest of the input is still arriving.
+        If `stdout_sink` is given it is called with FFmpeg's stdout and must
+        consume it to EOF. Only the last STDERR_TAIL_LINES lines of stderr
+        are kept. Raises subprocess.TimeoutExpired after killing FFmpeg on
+        timeout.
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input_stream is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE if stdout_sink is not None else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        for pipe in (proc.stdin, proc.stdout):
+            if pipe is not None:
+                _grow_pipe(pipe)
+
+        # Only the tail of stderr is kept; that's where FFmpeg reports errors
+        stderr_tail: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        threads = [
+            threading.Thread(
+                target=stderr_tail.extend,
+                args=(proc.stderr,),
+                daemon=True,
+            ),
+        ]
+        if input_stream is not None:
+            threads.append(
+                threading.Thread(
+                    target=self._feed_stdin,
+                    args=(proc, input_stream, entry_id),
+                    daemon=True,
+                ),
+            )
+        # A watchdog rather than wait(timeout=...), since the stdout sink may
+        # block this thread until FFmpeg exits
+        timed_out = threading.Event()
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"Entry {entry_id}: FFmpeg timed out during MP3 conversion")
-            return False
-        except Exception as e:
-            logger.error(f"Entry {entry_id}: Error during MP3 conversion: {str(e)}")
-            return False
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
 
-    def _is_mp3_file(self, s3_key: str) -> bool:
-        """Check if file is already in MP3 format"""
-        path = Path(s3_key)
-        return path.suffix.lower() == ".mp3"
+        watchdog = threading.Timer(timeout, kill_on_timeout)
+        watchdog.start()
+        for thread in threads:
+            thread.start()
 
-    def _verify_mp3_file(self, file_path: str, entry_id: str) -> bool:
-        """Verify that the file is a valid MP3 file using FFmpeg"""
         try:
-            # Use FFmpeg to probe the file and verify it's a valid MP3
-            cmd = [
-                "ffprobe",
-                "-v",
-                "quiet",
-                "-show_format",
-                "-show_streams",
-                "-of",
-                "json",
-                file_path,
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
+            if stdout_sink is not None:
+                with proc.stdout:
+                    stdout_sink(proc.stdout)
+            proc.wait()
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            watchdog.cancel()
+            for thread in threads:
+                thread.join()
 
-            if result.returncode == 0:
-                # Check if the file has MP3 format info
-                output = result.stdout
-                if "mp3" in output.lower() and "audio" in output.lower():
-                    logger.debug(f"Entry {entry_id}: MP3 file verification successful")
-                    return True
-                else:
-                    logger.warning(
-                        f"Entry {entry_id}: File does not appear to be valid MP3 format",
-                    )
-                    return False
-            else:
-                logger.error(
-                    f"Entry {entry_id}: FFprobe failed to verify MP3 file: {result.stderr}",
-                )
-                return False
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return proc.returncode, b"".join(stderr_tail).decode(errors="replace")
 
+    @staticmethod
+    def _feed_stdin(proc: subprocess.Popen, input_stream: Any, entry_id: str):
+        """Copy a streaming body into FFmpeg's stdin until EOF"""
+        try:
+            while chunk := input_stream.read(STREAM_CHUNK_SIZE):
+                proc.stdin.write(chunk)
+        except BrokenPipeError:
+            # FFmpeg exited early; its return code reports the failure
+            pass
         except Exception as e:
-            logger.error(f"Entry {entry_id}: Error verifying MP3 file: {str(e)}")
-            return False
+            # Kill FFmpeg so truncated input can't produce a "successful" MP3
+            logger.error(
+                f"Entry {entry_id}: Failed to stream input to FFmpeg: {str(e)}",
+            )
+            proc.kill()
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
 
-    def validate_input_file(self, s3_key: str) -> tuple[bool, str | None]:
-        """Validate input file for conversion"""
+    def _is_mp3_file(self, s3_key: str) -> bool:
+        """Check if file is already in MP3 format"""
+        path = Path(s3_key)
+        return path.suffix.lower() == ".mp3"
 
-        try:
-            # Check if file exists in S3
-            if not self.s3_service.file_exists(s3_key):
-                return False, "File does not exist in S3"
+    def validate_input_file(
+        self,
+        s3_key: str,
+        file_info: dict | None = None,
+    ) -> tuple[bool, str | None, dict | None]:
+        """Validate input file for conversion
 
-            # Get file info from S3
-            file_info = self.s3_service.get_file_info(s3_key)
-            if not file_info:
-                return False, "Could not get file info from S3"
+        Pass `file_info` from an earlier get_file_info call to skip the HEAD
+        request. Returns (valid, error, file_info) so callers can reuse it.
+        """
 
+        try:
             # Check file extension (supported input formats for FFmpeg)
             path = Path(s3_key)
-            supported_extensions = [
-                ".mp3",
-                ".wav",
-                ".flac",
-                ".aac",
-                ".ogg",
-                ".wma",
-                ".m4a",
-                ".mp4",
-                ".avi",
-                ".mov",
-                ".mkv",
-                ".webm",
-                ".mpeg",
-                ".mpg",
-            ]
 
             # Check for temporary files that should not be processed
             if path.suffix.lower() == ".part":
                 return (
                     False,
                     "Temporary download file (.part) - download may still be in progress",
+                    file_info,
                 )
 
-            if path.suffix.lower() not in supported_extensions:
+            if path.suffix.lower() not in SUPPORTED_INPUT_EXTENSIONS:
                 return (
                     False,
-                    f"Unsupported input format: {path.suffix}. Supported: {', '.join(supported_extensions)}",
+                    f"Unsupported input format: {path.suffix}. Supported: {', '.join(SUPPORTED_INPUT_FORMATS)}",
+                    file_info,
                 )
 
+            # One HEAD both confirms the file exists and gets its size
+            if file_info is None:
+                file_info = self.s3_service.get_file_info(s3_key)
+            if not file_info:
+                return False, "File does not exist in S3", None
+
             # Check file size
             file_size = file_info.get("size", 0)
             if file_size == 0:
-                return False, "File is empty"
+                return False, "File is empty", file_info
 
             # Check reasonable file size limits (use max_upload_size for general validation)
             if file_size > settings.max_upload_size:
                 return (
                     False,
                     f"File too large for conversion: {file_size} bytes (max: {settings.max_upload_size} bytes)",
+                    file_info,
                 )
 
-            return True, None
+            return True, None, file_info
 
         except Exception as e:
-            return False, f"File validation error: {str(e)}"
+            return False, f"File validation error: {str(e)}", file_info
 
     def get_supported_input_formats(self) -> list[str]:
         """Get list of supported input formats for conversion"""
-        return [
-            ".mp3",
-            ".wav",
-            ".flac",
-            ".aac",
-            ".ogg",
-            ".wma",
-            ".m4a",
-            ".mp4",
-            ".avi",
-            ".mov",
-            ".mkv",
-            ".webm",
-            ".mpeg",
-            ".mpg",
-        ]
+        return list(SUPPORTED_INPUT_FORMATS)
 
     def get_groq_compatible_formats(self) -> list[str]:
         """Get list of Groq-compatible formats"""
-        return [
-            ".flac",
-            ".mp3",
-            ".mp4",
-            ".mpeg",
-            ".mpga",
-            ".m4a",
-            ".ogg",
-            ".wav",
-            ".webm",
-        ]
+        return list(GROQ_COMPATIBLE_FORMATS)
 
     def is_groq_compatible(self, s3_key: str) -> bool:
         """Check if file format is compatible with Groq"""
         path = Path(s3_key)
-        return path.suffix.lower() in self.get_groq_compatible_formats()
+        return path.suffix.lower() in GROQ_COMPATIBLE_EXTENSIONS
 
     async def ensure_groq_compatibility(
         self,
@@ -439,39 +856,15 @@ class AudioConversionService:
     def is_permanent_error(self, error_message: str) -> bool:
         """Determine if a conversion error is permanent and should not be retried"""
 
-        permanent_error_patterns = [
-            "File not found",
-            "Unsupported input format",
-            "File too large",
-            "File is empty",
-            "File validation failed",
-            "Invalid file format",
-            "file size exceeds",
-            "unsupported media type",
-            "corrupted file",
-            "invalid audio stream",
-            "no audio stream found",
-        ]
-
-        return any(
-            pattern.lower() in error_message.lower()
-            for pattern in permanent_error_patterns
-        )
+        return _PERMANENT_ERROR_RE.search(error_message) is not None
 
     async def health_check(self) -> bool:
         """Check if FFmpeg is available for conversion"""
 
         try:
-            # Check if FFmpeg is installed
-            result = subprocess.run(
-                ["ffmpeg", "-version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            if result.returncode == 0:
-                logger.info("FFmpeg is available for audio conversion")
+            # Cached per ffmpeg binary, so frequent polling doesn't fork
+            if await ffmpeg_available():
+                logger.debug("FFmpeg is available for audio conversion")
                 return True
             else:
                 logger.error("FFmpeg is not available")
@@ -1,3 +1,4 @@
+import asyncpg
 from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
@@ -7,16 +8,36 @@ from app.core.config import settings
 engine = create_engine(settings.database_url)
 Base = declarative_base()
 
+# Each entry the ASR worker has in flight holds its own session, and one more
+# claims or refills work; the download worker needs a single session
+_pool_size = settings.db_pool_size or (
+    max(1, settings.worker_concurrency) + max(0, settings.asr_prefetch) + 1
+)
+
 # Async engine for worker operations
 async_engine = create_async_engine(
     settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
     echo=False,
+    pool_size=_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={
+        # The worker runs the same handful of queries in a loop; keep their
+        # prepared statements cached per connection instead of re-parsing
+        "prepared_statement_cache_size": 512,
+        # Short OLTP queries never benefit from JIT, but can pay its startup
+        "server_settings": {"jit": "off"},
+    },
 )
 
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    # Writes are explicit UPDATE statements followed by commit(), so there
+    # are never pending ORM changes for a query to flush first
+    autoflush=False,
 )
 
 
@@ -60,9 +81,64 @@ def ensure_entry_schema() -> None:
             connection.execute(statement)
 
 
+# Postgres channel the entries trigger notifies; the payload is the new status
+ENTRY_CHANGES_CHANNEL = "entries_changed"
+
+
+def ensure_entry_notify_trigger() -> None:
+    """Install the trigger that wakes workers when an entry changes status.
+
+    Only inserts and error-free transitions notify. A worker putting an entry
+    back to NEW after a temporary failure always records the error, and
+    waking on that would skip the retry backoff.
+    """
+
+    inspector = inspect(engine)
+    if "entries" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"""
+                CREATE OR REPLACE FUNCTION notify_entry_change() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'INSERT' OR NEW.error_message IS NULL THEN
+                        PERFORM pg_notify('{ENTRY_CHANGES_CHANNEL}', NEW.status::text);
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+                """,
+            ),
+        )
+        connection.execute(
+            text(
+                """
+                CREATE OR REPLACE TRIGGER entries_notify_change
+                AFTER INSERT OR UPDATE OF status, file_path ON entries
+                FOR EACH ROW EXECUTE FUNCTION notify_entry_change()
+                """,
+            ),
+        )
+
+
+async def listen_for_entry_changes(callback, on_lost=None) -> asyncpg.Connection:
+    """Open a dedicated connection that calls `callback` on entry changes.
+
+    The callback gets asyncpg's (connection, pid, channel, payload) arguments;
+    `on_lost(connection)` is called if the connection closes. The caller
+    closes the returned connection to stop listening.
+    """
+
+    connection = await asyncpg.connect(settings.database_url)
+    await connection.add_listener(ENTRY_CHANGES_CHANNEL, callback)
+    if on_lost is not None:
+        connection.add_termination_listener(on_lost)
+    return connection
+
+
 async def get_async_db():
+    # The context manager closes the session on exit
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
@@ -1,14 +1,26 @@
 import os
+import re
 import asyncio
+import threading
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 import httpx
 import yt_dlp
+from yt_dlp.utils import match_filter_func
 from loguru import logger
 
 from app.core.config import settings
+from app.core.executors import DOWNLOAD_POOL
+from app.core.rate_limit import HostRateLimiter
 from app.services.s3_service import S3Service
-from app.services.audio_conversion_service import AudioConversionService
+from app.services.audio_conversion_service import (
+    SEEKABLE_INPUT_EXTENSIONS,
+    STREAM_CHUNK_SIZE,
+    AudioConversionService,
+)
+
+COOKIE_FILE = "/app/cookies.txt"
 
 DIRECT_FILE_EXTENSIONS = {
     ".mp3",
@@ -28,27 +40,102 @@ DIRECT_FILE_EXTENSIONS = {
 }
 
 
+# Compiled once so classifying an error is a single case-insensitive scan
+_PERMANENT_ERROR_RE = re.compile(
+    "|".join(
+        re.escape(pattern)
+        for pattern in (
+            "Unsupported URL",
+            "Private video",
+            "Video unavailable",
+            "This video is not available",
+            "Invalid URL",
+            "File too large",
+            "Unsupported file format",
+            "Sign in to confirm you're not a bot",  # YouTube auth error
+        )
+    ),
+    re.IGNORECASE,
+)
+
+_AUTH_ERROR_RE = re.compile(
+    "|".join(
+        re.escape(pattern)
+        for pattern in (
+            "Sign in to confirm you're not a bot",
+            "Use --cookies-from-browser",
+            "--cookies for the authentication",
+            "This video is private",
+            "Video unavailable",
+        )
+    ),
+    re.IGNORECASE,
+)
+
+# Anything but letters, digits, spaces, hyphens and underscores
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w \-]")
+
+
+@lru_cache(maxsize=4096)
+def _is_supported_host(netloc: str, supported_suffixes: tuple[str, ...]) -> bool:
+    """Match a URL host against supported domain suffixes (cached per host)"""
+    host = netloc.lower().rpartition("@")[2].partition(":")[0]
+    return ("." + host.removeprefix("www.")).endswith(supported_suffixes)
+
+
+class _HttpBodyReader:
+    """File-like reader over a streaming httpx response with a size cap
+
+    Reading past `max_size` sets `too_large` and raises, which stops FFmpeg.
+    """
+
+    def __init__(self, response: httpx.Response, max_size: int):
+        self._chunks = response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE)
+        self._buffer = bytearray()
+        self._max_size = max_size
+        self.size = 0
+        self.too_large = False
+
+    def read(self, size: int = -1) -> bytes:
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, b"")
+            if not chunk:
+                break
+            self.size += len(chunk)
+            if self.size > self._max_size:
+                self.too_large = True
+                raise ValueError(f"File too large (max: {self._max_size} bytes)")
+            self._buffer += chunk
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
 class DownloadService:
     def __init__(self):
         self.download_dir = Path(settings.download_dir)
         self.download_dir.mkdir(exist_ok=True)
+        # ".youtube.com" etc., so a host matches the domain or any subdomain
+        self._supported_suffixes = tuple(
+            "." + domain.lower().lstrip(".")
+            for domain in settings.supported_url_domains
+        )
+        self._max_upload_size = settings.max_upload_size
+        self._ydl_opts_base = self._get_ydl_opts_template()
         self.s3_service = S3Service()
         self.conversion_service = AudioConversionService()
+        # Spaces out yt-dlp downloads per host, replacing per-download sleeps
+        self._rate_limiter = HostRateLimiter(settings.download_rate_per_minute)
+        # One YoutubeDL per download thread, see _get_ydl
+        self._ydl_local = threading.local()
 
     def _is_supported_url(self, url: str) -> bool:
         """Check if URL is from supported domains"""
 
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-
-            # Remove www. prefix if present
-            if domain.startswith("www."):
-                domain = domain[4:]
-
-            return any(
-                supported in domain for supported in settings.supported_url_domains
-            )
+            return _is_supported_host(urlparse(url).netloc, self._supported_suffixes)
 
         except Exception as e:
             logger.error(f"Error parsing URL {url}: {str(e)}")
@@ -75,14 +162,11 @@ class DownloadService:
                 try:
                     head = await client.head(url)
                     content_length = head.headers.get("content-length")
-                    if (
-                        content_length
-                        and int(content_length) > settings.max_upload_size
-                    ):
+                    if content_length and int(content_length) > self._max_upload_size:
                         return (
                             False,
                             None,
-                            f"File too large: {content_length} bytes (max: {settings.max_upload_size} bytes)",
+                            f"File too large: {content_length} bytes (max: {self._max_upload_size} bytes)",
                         )
                 except Exception:
                     pass  # HEAD not supported - proceed with GET
@@ -99,12 +183,12 @@ class DownloadService:
                     with open(local_path, "wb") as f:
                         async for chunk in response.aiter_bytes(chunk_size=65536):
                             total_size += len(chunk)
-                            if total_size > settings.max_upload_size:
+                            if total_size > self._max_upload_size:
                                 local_path.unlink(missing_ok=True)
                                 return (
                                     False,
                                     None,
-                                    f"File too large (max: {settings.max_upload_size} bytes)",
+                                    f"File too large (max: {self._max_upload_size} bytes)",
                                 )
                             f.write(chunk)
 
@@ -118,13 +202,87 @@ class DownloadService:
         except Exception as e:
             return False, None, f"Direct download error: {str(e)}"
 
-    def _get_ydl_opts(self, entry_id: str) -> dict:
-        """Get yt-dlp options for download"""
+    def _open_http_stream(
+        self,
+        url: str,
+    ) -> tuple[httpx.Client, httpx.Response]:
+        """Send a streaming GET for `url`; the caller closes both return values"""
+        client = httpx.Client(follow_redirects=True, timeout=300)
+        try:
+            response = client.send(client.build_request("GET", url), stream=True)
+            response.raise_for_status()
+        except Exception:
+            client.close()
+            raise
+        return client, response
 
-        opts = {
+    async def _stream_direct_file_to_mp3(
+        self,
+        url: str,
+        entry_id: str,
+    ) -> tuple[bool, tuple[str, str] | None, str | None]:
+        """Pipe a direct file URL through FFmpeg into S3 without touching disk
+
+        Returns:
+            Tuple[success, (s3_key, filename), error_message]
+        """
+        try:
+            client, response = await asyncio.to_thread(self._open_http_stream, url)
+        except httpx.HTTPStatusError as e:
+            return False, None, f"HTTP error downloading file: {e.response.status_code}"
+        except Exception as e:
+            return False, None, f"Direct download error: {str(e)}"
+
+        try:
+            content_length = response.headers.get("content-length")
+            input_size = int(content_length) if content_length else None
+            if input_size and input_size > self._max_upload_size:
+                return (
+                    False,
+                    None,
+                    f"File too large: {input_size} bytes (max: {self._max_upload_size} bytes)",
+                )
+
+            reader = _HttpBodyReader(response, self._max_upload_size)
+            (
+                conversion_success,
+                mp3_s3_key,
+                conversion_error,
+            ) = await self.conversion_service.convert_stream_to_mp3_and_upload(
+                reader,
+                entry_id,
+                input_size,
+            )
+        finally:
+            await asyncio.to_thread(response.close)
+            await asyncio.to_thread(client.close)
+
+        if reader.too_large:
+            return (
+                False,
+                None,
+                f"File too large (max: {self._max_upload_size} bytes)",
+            )
+        if not conversion_success:
+            return False, None, f"Failed to convert and upload file: {conversion_error}"
+
+        logger.info(
+            f"Entry {entry_id}: Streamed {reader.size} bytes from URL through MP3 conversion to S3: {mp3_s3_key}",
+        )
+        return True, (mp3_s3_key, Path(mp3_s3_key).name), None
+
+    def _get_ydl_opts_template(self) -> dict:
+        """yt-dlp options shared by every download (built once in __init__)"""
+
+        return {
             "format": "bestaudio/best[height<=720][ext=mp4]/best[height<=720]/best[ext=mp4]/best",
-            "outtmpl": str(self.download_dir / f"{entry_id}.%(ext)s"),
-            "max_filesize": settings.max_upload_size,
+            "max_filesize": self._max_upload_size,
+            # Rejects oversized videos from the extracted metadata, before any
+            # download starts; max_filesize then covers sizes only known later
+            "match_filter": match_filter_func(
+                f"filesize <? {self._max_upload_size} "
+                f"& filesize_approx <? {self._max_upload_size}",
+            ),
             "quiet": True,
             "no_warnings": True,
             "extractaudio": False,  # Keep original format, will convert to MP3 later
@@ -142,20 +300,39 @@ class DownloadService:
             },
             "socket_timeout": 30,
             "retries": 3,
-            # Anti-bot measures
-            "sleep_interval": 1,
-            "max_sleep_interval": 5,
+            # Fetch in 10 MB ranged requests, which YouTube throttles less than
+            # one long response, and pull DASH/HLS fragments 4 at a time
+            "http_chunk_size": 10 * 1024 * 1024,
+            "concurrent_fragment_downloads": 4,
+            # Anti-bot measures; downloads themselves are spaced out by
+            # the host rate limiter in download_to_local
             "sleep_interval_requests": 1,
         }
 
-        # Add cookie support if available
-        cookie_file = Path("/app/cookies.txt")
-        if cookie_file.exists():
+    def _get_ydl_opts(self, entry_id: str, use_cookies: bool = False) -> dict:
+        """Get yt-dlp options for download"""
+
+        opts = {
+            **self._ydl_opts_base,
+            "outtmpl": str(self.download_dir / f"{entry_id}.%(ext)s"),
+        }
+
+        # Cookied requests share the account's rate limit, so they're only
+        # sent when a download has already failed for lack of them
+        cookie_file = Path(COOKIE_FILE)
+        if use_cookies and cookie_file.exists():
             opts["cookiefile"] = str(cookie_file)
             logger.info(f"Using cookie file for entry {entry_id}")
 
         return opts
 
+    def is_streamable_url(self, url: str) -> bool:
+        """Direct file URLs FFmpeg can read straight from the HTTP body"""
+        return (
+            self._is_direct_file_url(url)
+            and Path(urlparse(url).path).suffix.lower() not in SEEKABLE_INPUT_EXTENSIONS
+        )
+
     async def download_from_url(
         self,
         url: str,
@@ -168,96 +345,181 @@ class DownloadService:
         Returns:
             Tuple[success, (s3_key, filename), error_message]
         """
-        # Clean up any leftover .part files from previous failed downloads
-        self.cleanup_part_files(entry_id)
-
         try:
-            if self._is_direct_file_url(url):
-                # Direct file URL – download via HTTP without yt-dlp
+            if self.is_streamable_url(url):
+                # Direct file URL in a streamable format – pipe the HTTP body
+                # through FFmpeg into S3 with no local file
                 logger.info(
-                    f"Entry {entry_id}: Direct file URL detected, downloading via HTTP",
+                    f"Entry {entry_id}: Direct file URL detected, streaming via HTTP",
                 )
-                success, local_file_info, error_msg = await self._download_direct_file(
-                    url,
-                    entry_id,
+                return await self._stream_direct_file_to_mp3(url, entry_id)
+
+            success, local_file_info, error_msg = await self.download_to_local(
+                url,
+                entry_id,
+            )
+            if not (success and local_file_info):
+                return False, None, error_msg
+
+            return await self.convert_and_upload(local_file_info, entry_id)
+
+        except Exception as e:
+            error_msg = f"Unexpected download error: {str(e)}"
+            logger.error(f"Entry {entry_id}: {error_msg}")
+            return False, None, error_msg
+
+    async def download_to_local(
+        self,
+        url: str,
+        entry_id: str,
+    ) -> tuple[bool, tuple[str, str] | None, str | None]:
+        """
+        Download video/audio from URL into the download dir (first pipeline stage)
+
+        Returns:
+            Tuple[success, (local_path, filename), error_message]
+        """
+        # Clean up any leftover .part files from previous failed downloads
+        self.cleanup_part_files(entry_id)
+
+        if self._is_direct_file_url(url):
+            # Direct MP4-family file URL – FFmpeg needs a seekable input,
+            # so download via HTTP to a local file first
+            logger.info(
+                f"Entry {entry_id}: Direct file URL detected, downloading via HTTP",
+            )
+            success, local_file_info, error_msg = await self._download_direct_file(
+                url,
+                entry_id,
+            )
+        elif self._is_supported_url(url):
+            # Platform URL (YouTube, Vimeo, …) – use yt-dlp
+            host = urlparse(url).netloc.lower().removeprefix("www.")
+            waited = await self._rate_limiter.acquire(host)
+            if waited:
+                logger.debug(
+                    f"Entry {entry_id}: Waited {waited:.1f}s for {host} rate limit",
                 )
-            elif self._is_supported_url(url):
-                # Platform URL (YouTube, Vimeo, …) – use yt-dlp
-                ydl_opts = self._get_ydl_opts(entry_id)
-                loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
+            success, local_file_info, error_msg = await loop.run_in_executor(
+                DOWNLOAD_POOL,
+                self._download_sync,
+                url,
+                self._get_ydl_opts(entry_id),
+                entry_id,
+            )
+            if (
+                not success
+                and error_msg
+                and self.is_youtube_auth_error(error_msg)
+                and os.path.exists(COOKIE_FILE)
+            ):
+                logger.info(f"Entry {entry_id}: Retrying download with cookies")
+                self.cleanup_part_files(entry_id)
+                await self._rate_limiter.acquire(host)
                 success, local_file_info, error_msg = await loop.run_in_executor(
-                    None,
+                    DOWNLOAD_POOL,
                     self._download_sync,
                     url,
-                    ydl_opts,
+                    self._get_ydl_opts(entry_id, use_cookies=True),
                     entry_id,
                 )
-            else:
-                error_msg = f"Unsupported URL. Supported platforms: {', '.join(settings.supported_url_domains)}. Direct audio/video file URLs (e.g. .mp3, .mp4) are also accepted."
-                logger.warning(f"Entry {entry_id}: {error_msg}")
-                return False, None, error_msg
+        else:
+            error_msg = f"Unsupported URL. Supported platforms: {', '.join(settings.supported_url_domains)}. Direct audio/video file URLs (e.g. .mp3, .mp4) are also accepted."
+            logger.warning(f"Entry {entry_id}: {error_msg}")
+            return False, None, error_msg
 
-            if success and local_file_info:
-                local_file_path, filename = local_file_info
+        if not (success and local_file_info):
+            logger.error(f"Entry {entry_id}: Download failed - {error_msg}")
+        return success, local_file_info, error_msg
 
-                # Get original file size for traffic reduction logging
-                original_size = os.path.getsize(local_file_path)
+    async def convert_and_upload(
+        self,
+        local_file_info: tuple[str, str],
+        entry_id: str,
+    ) -> tuple[bool, tuple[str, str] | None, str | None]:
+        """
+        Convert a downloaded file to MP3 and upload it to S3 (second pipeline stage)
+        The local file is removed afterwards whether or not conversion succeeded
 
-                # Convert to MP3 before uploading to S3 (reduces S3 traffic)
-                logger.info(
-                    f"Entry {entry_id}: Converting downloaded file ({original_size} bytes) to MP3 before S3 upload",
-                )
-                (
-                    conversion_success,
-                    mp3_s3_key,
-                    conversion_error,
-                ) = await self.conversion_service.convert_local_to_mp3_and_upload(
-                    local_file_path,
-                    entry_id,
-                )
+        Returns:
+            Tuple[success, (s3_key, filename), error_message]
+        """
+        local_file_path, filename = local_file_info
 
-                # Clean up original downloaded file
-                try:
-                    os.unlink(local_file_path)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to cleanup original file {local_file_path}: {str(e)}",
-                    )
-
-                if conversion_success:
-                    # Get MP3 file size from S3 to calculate traffic reduction
-                    mp3_file_info = self.s3_service.get_file_info(mp3_s3_key)
-                    mp3_size = mp3_file_info.get("size", 0) if mp3_file_info else 0
-
-                    # Log traffic reduction benefits
-                    if mp3_size > 0 and mp3_size < original_size:
-                        saved_bytes = original_size - mp3_size
-                        logger.info(
-                            f"Entry {entry_id}: Conversion reduced S3 upload size by {saved_bytes} bytes ({saved_bytes / (1024 * 1024):.1f} MB)",
-                        )
-                        logger.info(
-                            f"Entry {entry_id}: S3 traffic reduction: {(saved_bytes / original_size) * 100:.1f}%",
-                        )
+        # Get original file size for traffic reduction logging
+        original_size = os.path.getsize(local_file_path)
 
-                    logger.info(
-                        f"Entry {entry_id}: Successfully downloaded, converted, and uploaded to S3: {mp3_s3_key}",
-                    )
-                    mp3_filename = Path(mp3_s3_key).name
-                    return True, (mp3_s3_key, mp3_filename), None
-                else:
-                    return (
-                        False,
-                        None,
-                        f"Failed to convert and upload file: {conversion_error}",
-                    )
-            else:
-                logger.error(f"Entry {entry_id}: Download failed - {error_msg}")
-                return False, None, error_msg
+        # Convert to MP3 before uploading to S3 (reduces S3 traffic)
+        logger.info(
+            f"Entry {entry_id}: Converting downloaded file ({original_size} bytes) to MP3 before S3 upload",
+        )
+        (
+            conversion_success,
+            mp3_s3_key,
+            conversion_error,
+        ) = await self.conversion_service.convert_local_to_mp3_and_upload(
+            local_file_path,
+            entry_id,
+        )
 
+        # Clean up original downloaded file
+        try:
+            os.unlink(local_file_path)
         except Exception as e:
-            error_msg = f"Unexpected download error: {str(e)}"
-            logger.error(f"Entry {entry_id}: {error_msg}")
-            return False, None, error_msg
+            logger.warning(
+                f"Failed to cleanup original file {local_file_path}: {str(e)}",
+            )
+
+        if not conversion_success:
+            return (
+                False,
+                None,
+                f"Failed to convert and upload file: {conversion_error}",
+            )
+
+        # Get MP3 file size from S3 to calculate traffic reduction
+        mp3_file_info = await asyncio.to_thread(
+            self.s3_service.get_file_info,
+            mp3_s3_key,
+        )
+        mp3_size = mp3_file_info.get("size", 0) if mp3_file_info else 0
+
+        # Log traffic reduction benefits
+        if mp3_size > 0 and mp3_size < original_size:
+            saved_bytes = original_size - mp3_size
+            logger.info(
+                f"Entry {entry_id}: Conversion reduced S3 upload size by {saved_bytes} bytes ({saved_bytes / (1024 * 1024):.1f} MB)",
+            )
+            logger.info(
+                f"Entry {entry_id}: S3 traffic reduction: {(saved_bytes / original_size) * 100:.1f}%",
+            )
+
+        logger.info(
+            f"Entry {entry_id}: Successfully downloaded, converted, and uploaded to S3: {mp3_s3_key}",
+        )
+        mp3_filename = Path(mp3_s3_key).name
+        return True, (mp3_s3_key, mp3_filename), None
+
+    def _get_ydl(self, ydl_opts: dict) -> yt_dlp.YoutubeDL:
+        """Return the calling thread's YoutubeDL for these options
+
+        Creating a YoutubeDL loads the cookie file and sets up extractors and
+        the HTTP session, so each thread keeps one per cookie file and only
+        swaps in the entry's output template. YoutubeDL isn't thread-safe,
+        hence per thread rather than per service.
+        """
+
+        instances = getattr(self._ydl_local, "instances", None)
+        if instances is None:
+            instances = self._ydl_local.instances = {}
+
+        key = ydl_opts.get("cookiefile")
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = instances[key] = yt_dlp.YoutubeDL(ydl_opts)
+        ydl.params["outtmpl"]["default"] = ydl_opts["outtmpl"]
+        return ydl
 
     def _download_sync(
         self,
@@ -268,67 +530,49 @@ class DownloadService:
         """Synchronous download function to run in executor"""
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first to get filename
-                info = ydl.extract_info(url, download=False)
-
-                # Check file size if available - use max_upload_size for downloads (chunking will handle Groq limits)
-                if "filesize" in info and info["filesize"]:
-                    if info["filesize"] > settings.max_upload_size:
-                        return (
-                            False,
-                            None,
-                            f"File too large: {info['filesize']} bytes (max: {settings.max_upload_size} bytes)",
-                        )
-
-                # Download the file
-                ydl.download([url])
-
-                # Find the downloaded file - use the entry_id passed as parameter
-                # Filter out temporary .part files created during download
-                downloaded_files = [
-                    f
-                    for f in self.download_dir.glob(f"{entry_id}.*")
-                    if f.suffix != ".part"
-                ]
-
-                if downloaded_files:
-                    downloaded_file = downloaded_files[0]
-                    file_path = str(downloaded_file)
-
-                    # Extract original filename from video info
-                    original_filename = info.get("title", f"video_{entry_id}")
-                    # Sanitize filename for filesystem
-                    safe_filename = "".join(
-                        c
-                        for c in original_filename
-                        if c.isalnum() or c in (" ", "-", "_")
-                    ).strip()
-                    safe_filename = safe_filename[:100]  # Limit length
-
-                    # Get file extension from downloaded file
-                    file_extension = downloaded_file.suffix
-                    full_filename = f"{safe_filename}{file_extension}"
-
-                    # Create symbolic link with original filename
-                    link_path = self.download_dir / full_filename
-
-                    # Remove existing link if it exists
-                    if link_path.exists() or link_path.is_symlink():
-                        link_path.unlink()
-
-                    try:
-                        # Create symbolic link
-                        link_path.symlink_to(downloaded_file.name)
-                        logger.info(
-                            f"Created link: {link_path} -> {downloaded_file.name}",
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to create symbolic link: {str(e)}")
+            ydl = self._get_ydl(ydl_opts)
+            # Extract and download in one pass; match_filter and max_filesize
+            # make yt-dlp skip the download itself when the file is too large
+            try:
+                info = ydl.extract_info(url, download=True)
+            finally:
+                # Closing a YoutubeDL used to persist refreshed cookies
+                ydl.save_cookies()
+
+            # Check file size if available - use max_upload_size for downloads (chunking will handle Groq limits)
+            filesize = info.get("filesize") or info.get("filesize_approx")
+            if filesize and filesize > self._max_upload_size:
+                return (
+                    False,
+                    None,
+                    f"File too large: {filesize} bytes (max: {self._max_upload_size} bytes)",
+                )
 
-                    return True, (file_path, full_filename), None
-                else:
-                    return False, None, "Downloaded file not found"
+            # yt-dlp reports where it wrote the file, so there's no need
+            # to scan the download directory for it
+            requested = info.get("requested_downloads") or [{}]
+            filepath = requested[0].get("filepath")
+            downloaded_file = Path(filepath) if filepath else None
+
+            if downloaded_file and downloaded_file.is_file():
+                file_path = str(downloaded_file)
+
+                # Extract original filename from video info
+                original_filename = info.get("title", f"video_{entry_id}")
+                # Sanitize filename for filesystem
+                safe_filename = _UNSAFE_FILENAME_CHARS_RE.sub(
+                    "",
+                    original_filename,
+                ).strip()
+                safe_filename = safe_filename[:100]  # Limit length
+
+                # Get file extension from downloaded file
+                file_extension = downloaded_file.suffix
+                full_filename = f"{safe_filename}{file_extension}"
+
+                return True, (file_path, full_filename), None
+            else:
+                return False, None, "Downloaded file not found"
 
         except yt_dlp.DownloadError as e:
             error_msg = f"yt-dlp error: {str(e)}"
@@ -344,13 +588,34 @@ class DownloadService:
         except Exception as e:
             return False, None, f"Download error: {str(e)}"
 
+    def _remove_entry_files(
+        self,
+        entry_id: str,
+        part_only: bool = False,
+    ) -> list[str]:
+        """Delete download_dir files named after the entry, returning their paths
+
+        scandir exposes names without a stat() per file, which matters when
+        several workers share one download_dir.
+        """
+
+        prefix = f"{entry_id}."
+        removed = []
+        with os.scandir(self.download_dir) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                if name.startswith(prefix) and (
+                    not part_only or name.endswith(".part")
+                ):
+                    os.unlink(dir_entry.path)
+                    removed.append(dir_entry.path)
+        return removed
+
     def cleanup_failed_download(self, entry_id: str):
         """Clean up any partial downloads for failed entries"""
 
         try:
-            pattern = f"{entry_id}.*"
-            for file_path in self.download_dir.glob(pattern):
-                file_path.unlink()
+            for file_path in self._remove_entry_files(entry_id):
                 logger.info(f"Cleaned up partial download: {file_path}")
         except Exception as e:
             logger.error(f"Error cleaning up files for entry {entry_id}: {str(e)}")
@@ -359,9 +624,7 @@ class DownloadService:
         """Clean up .part files that may be left over from incomplete downloads"""
 
         try:
-            pattern = f"{entry_id}.*.part"
-            for file_path in self.download_dir.glob(pattern):
-                file_path.unlink()
+            for file_path in self._remove_entry_files(entry_id, part_only=True):
                 logger.info(f"Cleaned up .part file: {file_path}")
         except Exception as e:
             logger.warning(
@@ -371,52 +634,29 @@ class DownloadService:
     def is_permanent_error(self, error_message: str) -> bool:
         """Determine if an error is permanent and should not be retried"""
 
-        permanent_error_patterns = [
-            "Unsupported URL",
-            "Private video",
-            "Video unavailable",
-            "This video is not available",
-            "Invalid URL",
-            "File too large",
-            "Unsupported file format",
-            "Sign in to confirm you're not a bot",  # YouTube auth error
-        ]
-
-        return any(
-            pattern.lower() in error_message.lower()
-            for pattern in permanent_error_patterns
-        )
+        return _PERMANENT_ERROR_RE.search(error_message) is not None
 
     def is_youtube_auth_error(self, error_message: str) -> bool:
         """Check if error is related to YouTube authentication"""
 
-        auth_error_patterns = [
-            "Sign in to confirm you're not a bot",
-            "Use --cookies-from-browser",
-            "--cookies for the authentication",
-            "This video is private",
-            "Video unavailable",
-        ]
-
-        return any(
-            pattern.lower() in error_message.lower() for pattern in auth_error_patterns
-        )
+        return _AUTH_ERROR_RE.search(error_message) is not None
 
     def get_file_info(self, file_path: str) -> dict:
         """Get basic file information"""
 
+        path = Path(file_path)
         try:
-            path = Path(file_path)
-            if not path.exists():
-                return {}
-
+            # A single stat() answers both "does it exist" and "how big"
             stat = path.stat()
-            return {
-                "size": stat.st_size,
-                "extension": path.suffix,
-                "name": path.name,
-                "exists": True,
-            }
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             logger.error(f"Error getting file info for {file_path}: {str(e)}")
             return {"exists": False}
+
+        return {
+            "size": stat.st_size,
+            "extension": path.suffix,
+            "name": path.name,
+            "exists": True,
+        }
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, or_, select, update
+from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 import json
@@ -8,75 +9,157 @@ from loguru import logger
 from app.models.entry import Entry, EntryStatus, SourceType
 from app.core.config import settings
 
+# Built once instead of per call; the worker sets a status on nearly every
+# entry it touches
+_UPDATE_STATUS_STMT = (
+    update(Entry)
+    .where(Entry.id == bindparam("entry_id"))
+    .values(
+        status=bindparam("new_status"),
+        error_message=bindparam("new_error_message"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
 
 class EntryService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def fetch_new_entries_for_download(self, limit: int = None) -> list[Entry]:
-        """Fetch NEW entries with URLs for download processing"""
+    async def _claim_entries(self, *queries) -> list[Entry]:
+        """Lock the rows selected by queries and move them to IN_PROGRESS
 
-        if limit is None:
-            limit = settings.batch_size
+        A single UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+        RETURNING statement: rows already locked by another worker are
+        skipped rather than waited on, and there is no window between
+        picking an entry and claiming it. Several queries are claimed in the
+        same statement, each keeping its own limit.
+        """
 
-        query = (
-            select(Entry)
+        try:
+            claim = (
+                update(Entry)
+                .where(
+                    or_(
+                        *(
+                            Entry.id.in_(
+                                query.with_for_update(
+                                    skip_locked=True,
+                                ).scalar_subquery(),
+                            )
+                            for query in queries
+                        ),
+                    ),
+                )
+                .values(status=EntryStatus.IN_PROGRESS, error_message=None)
+                .returning(Entry)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(claim)
+            entries = sorted(result.scalars().all(), key=lambda e: e.created_at)
+            await self.db.commit()
+            return entries
+
+        except Exception as e:
+            logger.error(f"Failed to claim entries: {str(e)}")
+            await self.db.rollback()
+            return []
+
+    @staticmethod
+    def _ready_for_retry():
+        """NEW entries are claimable unless they failed within retry_cooldown
+
+        Temporary failures put an entry back to NEW with an error message;
+        without the cooldown a rate-limited or unreachable host would be
+        retried on every poll.
+        """
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.retry_cooldown)
+        return or_(Entry.error_message.is_(None), Entry.updated_at < cutoff)
+
+    @classmethod
+    def _new_url_entries_query(cls, limit: int):
+        return (
+            select(Entry.id)
             .where(
                 Entry.status == EntryStatus.NEW,
                 Entry.source_type == SourceType.URL,
                 Entry.source_url.isnot(None),
+                cls._ready_for_retry(),
             )
             .order_by(Entry.created_at)
             .limit(limit)
         )
 
-        result = await self.db.execute(query)
-        entries = result.scalars().all()
-
-        logger.info(f"Fetched {len(entries)} NEW URL entries for download")
-        return list(entries)
-
-    async def fetch_new_uploads_for_processing(self, limit: int = None) -> list[Entry]:
-        """Fetch NEW upload entries and move them to IN_PROGRESS"""
-
-        if limit is None:
-            limit = settings.batch_size
-
-        query = (
-            select(Entry)
+    @classmethod
+    def _new_uploads_query(cls, limit: int):
+        return (
+            select(Entry.id)
             .where(
                 Entry.status == EntryStatus.NEW,
                 Entry.source_type == SourceType.UPLOAD,
                 Entry.file_path.isnot(None),
+                cls._ready_for_retry(),
             )
             .order_by(Entry.created_at)
             .limit(limit)
         )
 
-        result = await self.db.execute(query)
-        entries = result.scalars().all()
+    async def claim_download_batch(
+        self,
+        limit: int = None,
+    ) -> tuple[list[Entry], list[Entry]]:
+        """Claim NEW URL entries and NEW uploads in one statement
 
-        # Move upload entries directly to IN_PROGRESS
-        for entry in entries:
-            await self.update_entry_status(entry.id, EntryStatus.IN_PROGRESS)
+        Returns (url_entries, uploads). Uploads need no download, so
+        claiming them is all the download worker does with them; URL entries
+        still have to be downloaded. Up to `limit` of each are claimed.
+        """
 
-        logger.info(f"Moved {len(entries)} NEW upload entries to IN_PROGRESS")
-        return list(entries)
+        if limit is None:
+            limit = settings.batch_size
+
+        entries = await self._claim_entries(
+            self._new_url_entries_query(limit),
+            self._new_uploads_query(limit),
+        )
+        url_entries = [e for e in entries if e.source_type == SourceType.URL]
+        uploads = [e for e in entries if e.source_type == SourceType.UPLOAD]
+
+        if entries:
+            logger.info(
+                f"Claimed {len(url_entries)} NEW URL entries for download and "
+                f"moved {len(uploads)} NEW upload entries to IN_PROGRESS",
+            )
+        return url_entries, uploads
+
+    async def fetch_in_progress_entries(
+        self,
+        limit: int = None,
+        exclude_ids: set[UUID] | None = None,
+    ) -> list[Entry]:
+        """Fetch IN_PROGRESS entries for ASR processing
 
-    async def fetch_in_progress_entries(self, limit: int = None) -> list[Entry]:
-        """Fetch IN_PROGRESS entries for ASR processing"""
+        `exclude_ids` skips entries this worker has already picked up.
+        """
 
         if limit is None:
             limit = settings.batch_size
 
+        conditions = [
+            Entry.status == EntryStatus.IN_PROGRESS,
+            Entry.file_path.isnot(None),
+        ]
+        if exclude_ids:
+            conditions.append(Entry.id.notin_(exclude_ids))
+
         query = (
             select(Entry)
-            .where(
-                Entry.status == EntryStatus.IN_PROGRESS,
-                Entry.file_path.isnot(None),
-            )
+            .where(*conditions)
             .order_by(Entry.created_at)
             .limit(limit)
+            # Don't block on rows another ASR worker is currently writing
+            .with_for_update(skip_locked=True)
         )
 
         result = await self.db.execute(query)
@@ -94,16 +177,15 @@ class EntryService:
         """Update entry status and optional error message"""
 
         try:
-            update_data = {"status": status}
-            if error_message:
-                update_data["error_message"] = error_message
-            else:
-                # Clear error message when status changes successfully
-                update_data["error_message"] = None
-
-            query = update(Entry).where(Entry.id == entry_id).values(**update_data)
-
-            await self.db.execute(query)
+            await self.db.execute(
+                _UPDATE_STATUS_STMT,
+                {
+                    "entry_id": entry_id,
+                    "new_status": status,
+                    # Clear error message when status changes successfully
+                    "new_error_message": error_message or None,
+                },
+            )
             await self.db.commit()
 
             logger.info(f"Updated entry {entry_id} status to {status}")
@@ -114,29 +196,44 @@ class EntryService:
             await self.db.rollback()
             return False
 
-    async def update_entry_file_path(
+    async def bulk_update_entry_statuses(
         self,
-        entry_id: UUID,
-        file_path: str,
-        filename: str | None = None,
+        updates: list[tuple[UUID, EntryStatus, str | None]],
+        files: dict[UUID, tuple[str, str]] | None = None,
     ) -> bool:
-        """Update entry with downloaded file path"""
+        """Update several entries' status and error message in one commit
 
-        try:
-            update_data = {"file_path": file_path}
-            if filename:
-                update_data["filename"] = filename
+        Uses an ORM bulk UPDATE by primary key, which asyncpg runs as a
+        single pipelined executemany instead of one round trip per entry.
+        Entries listed in `files` also get their (file_path, filename) set.
+        """
 
-            query = update(Entry).where(Entry.id == entry_id).values(**update_data)
+        if not updates:
+            return True
 
-            await self.db.execute(query)
+        files = files or {}
+        status_rows = []
+        file_rows = []
+        for entry_id, status, error_message in updates:
+            row = {"id": entry_id, "status": status, "error_message": error_message}
+            if entry_id in files:
+                row["file_path"], row["filename"] = files[entry_id]
+                file_rows.append(row)
+            else:
+                status_rows.append(row)
+
+        try:
+            # One executemany per column set
+            for rows in (status_rows, file_rows):
+                if rows:
+                    await self.db.execute(update(Entry), rows)
             await self.db.commit()
 
-            logger.info(f"Updated entry {entry_id} file path: {file_path}")
+            logger.info(f"Updated status of {len(updates)} entries")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to update file path for entry {entry_id}: {str(e)}")
+            logger.error(f"Failed to bulk update {len(updates)} entries: {str(e)}")
             await self.db.rollback()
             return False
 
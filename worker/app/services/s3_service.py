@@ -1,25 +1,100 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 import tempfile
 import os
-from typing import BinaryIO
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from loguru import logger
 
 from app.core.config import settings
+from app.core.scratch import scratch_dir
+
+
+class S3NotFound(Exception):
+    """Raised when a requested S3 object does not exist"""
+
+
+# Seconds a HEAD result is reused; covers validate -> convert -> retry within
+# one processing pass without serving stale metadata for long
+FILE_INFO_TTL = 30.0
+# Most recently used HEAD results kept; older ones are evicted
+FILE_INFO_CACHE_SIZE = 1024
+# Local files below this go up in a single PUT; at or above it they are
+# uploaded multipart through s3transfer
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
 
 
 class S3Service:
+    # Shared by every instance; each service constructs its own S3Service.
+    # Accessed from worker threads, hence the lock.
+    _file_info_cache: OrderedDict[tuple[str, str], tuple[float, dict]] = OrderedDict()
+    _file_info_lock = threading.Lock()
+    # One client (and connection pool) for the whole process
+    _shared_client = None
+    _client_lock = threading.Lock()
+    # Buckets already verified/created by this process
+    _bucket_checked: set[str] = set()
+
+    @classmethod
+    def _get_client(cls):
+        with cls._client_lock:
+            if cls._shared_client is None:
+                cls._shared_client = boto3.client(
+                    "s3",
+                    endpoint_url=settings.s3_endpoint_url,
+                    aws_access_key_id=settings.s3_access_key,
+                    aws_secret_access_key=settings.s3_secret_key,
+                    region_name="us-east-1",  # MinIO default region
+                    config=Config(
+                        # Every thread that calls into S3 (multipart parts,
+                        # range GETs, concurrent entries) draws from this
+                        # pool; botocore's default of 10 would churn TLS
+                        max_pool_connections=64,
+                        # Jittered exponential backoff plus client-side
+                        # throttling on 500/503 SlowDown/RequestTimeout and
+                        # connection errors. Applies to every call, including
+                        # multipart create/complete and each part, so a blip
+                        # doesn't fail the whole entry and send it back to NEW
+                        retries={"max_attempts": 10, "mode": "adaptive"},
+                        tcp_keepalive=True,
+                    ),
+                )
+            return cls._shared_client
+
     def __init__(self):
         try:
-            self.s3_client = boto3.client(
-                "s3",
-                endpoint_url=settings.s3_endpoint_url,
-                aws_access_key_id=settings.s3_access_key,
-                aws_secret_access_key=settings.s3_secret_key,
-                region_name="us-east-1",  # MinIO default region
-            )
+            self.s3_client = self._get_client()
             self.bucket_name = settings.s3_bucket_name
-            self._ensure_bucket_exists()
+            # Streamed uploads (e.g. FFmpeg stdout) are read part by part and
+            # the parts are sent concurrently while the producer keeps writing
+            self._stream_transfer_config = TransferConfig(
+                multipart_chunksize=8 * 1024 * 1024,
+                use_threads=True,
+            )
+            # Local files: single PUT below MULTIPART_THRESHOLD, above it 16MB
+            # parts with up to 10 in flight; a new part starts as soon as any one finishes.
+            # One connection tops out well below link speed, so anything
+            # bigger than a part or two benefits from going multipart.
+            self._file_transfer_config = TransferConfig(
+                multipart_threshold=MULTIPART_THRESHOLD,
+                multipart_chunksize=16 * 1024 * 1024,
+                max_concurrency=10,
+                use_threads=True,
+            )
+            # Downloads above 8MB are fetched as parallel 8MB range GETs
+            self._download_transfer_config = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=10,
+                use_threads=True,
+            )
+            if self.bucket_name not in S3Service._bucket_checked:
+                self._ensure_bucket_exists()
+                S3Service._bucket_checked.add(self.bucket_name)
         except Exception as e:
             logger.error(f"Failed to initialize S3 client: {str(e)}")
             raise
@@ -54,13 +129,24 @@ class S3Service:
             if content_type:
                 extra_args["ContentType"] = content_type
 
-            self.s3_client.upload_file(
-                local_path,
-                self.bucket_name,
-                key,
-                ExtraArgs=extra_args,
-            )
-            logger.info(f"Successfully uploaded file to S3: {local_path} -> {key}")
+            if os.path.getsize(local_path) < MULTIPART_THRESHOLD:
+                with open(local_path, "rb") as f:
+                    self.s3_client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Body=f,
+                        **extra_args,
+                    )
+            else:
+                self.s3_client.upload_file(
+                    local_path,
+                    self.bucket_name,
+                    key,
+                    ExtraArgs=extra_args,
+                    Config=self._file_transfer_config,
+                )
+            logger.debug(f"Successfully uploaded file to S3: {local_path} -> {key}")
+            self._forget_file_info(key)
             return True
         except Exception as e:
             logger.error(f"Failed to upload file {local_path} to S3: {str(e)}")
@@ -83,8 +169,10 @@ class S3Service:
                 self.bucket_name,
                 key,
                 ExtraArgs=extra_args,
+                Config=self._stream_transfer_config,
             )
-            logger.info(f"Successfully uploaded file to S3: {key}")
+            logger.debug(f"Successfully uploaded file to S3: {key}")
+            self._forget_file_info(key)
             return True
         except Exception as e:
             logger.error(f"Failed to upload file {key} to S3: {str(e)}")
@@ -93,8 +181,13 @@ class S3Service:
     def download_file(self, key: str, local_path: str) -> bool:
         """Download file from S3 to local path"""
         try:
-            self.s3_client.download_file(self.bucket_name, key, local_path)
-            logger.info(f"Successfully downloaded file from S3: {key} -> {local_path}")
+            self.s3_client.download_file(
+                self.bucket_name,
+                key,
+                local_path,
+                Config=self._download_transfer_config,
+            )
+            logger.debug(f"Successfully downloaded file from S3: {key} -> {local_path}")
             return True
         except Exception as e:
             logger.error(f"Failed to download file {key} from S3: {str(e)}")
@@ -117,7 +210,8 @@ class S3Service:
         """Delete file from S3"""
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
-            logger.info(f"Successfully deleted file from S3: {key}")
+            logger.debug(f"Successfully deleted file from S3: {key}")
+            self._forget_file_info(key)
             return True
         except Exception as e:
             logger.error(f"Failed to delete file {key} from S3: {str(e)}")
@@ -125,6 +219,8 @@ class S3Service:
 
     def file_exists(self, key: str) -> bool:
         """Check if file exists in S3"""
+        if self._cached_file_info(key) is not None:
+            return True
         try:
             self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
             return True
@@ -136,36 +232,113 @@ class S3Service:
                 return False
 
     def get_file_info(self, key: str) -> dict | None:
-        """Get file metadata from S3"""
+        """Get file metadata from S3
+
+        Results are reused for FILE_INFO_TTL seconds, so validation and the
+        steps after it share one HEAD request.
+        """
+        file_info = self._cached_file_info(key)
+        if file_info is not None:
+            return file_info
         try:
             response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
-            return {
+            file_info = {
                 "size": response["ContentLength"],
                 "content_type": response.get("ContentType", "application/octet-stream"),
                 "last_modified": response["LastModified"],
                 "etag": response["ETag"],
             }
+            self._remember_file_info(key, file_info)
+            return file_info
         except Exception as e:
             logger.error(f"Failed to get file info for {key}: {str(e)}")
             return None
 
-    def create_temp_download(self, key: str) -> str | None:
-        """Download file to temporary location and return path"""
-        try:
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False)
-            temp_path = temp_file.name
-            temp_file.close()
-
-            # Download from S3
-            if self.download_file(key, temp_path):
-                return temp_path
-            else:
-                # Clean up temp file if download failed
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+    def _cached_file_info(self, key: str) -> dict | None:
+        cache_key = (self.bucket_name, key)
+        with self._file_info_lock:
+            cached = self._file_info_cache.get(cache_key)
+            if cached is None:
+                return None
+            expires_at, file_info = cached
+            if expires_at < time.monotonic():
+                del self._file_info_cache[cache_key]
                 return None
+            self._file_info_cache.move_to_end(cache_key)
+            return file_info
+
+    def _remember_file_info(self, key: str, file_info: dict):
+        cache_key = (self.bucket_name, key)
+        with self._file_info_lock:
+            self._file_info_cache[cache_key] = (
+                time.monotonic() + FILE_INFO_TTL,
+                file_info,
+            )
+            self._file_info_cache.move_to_end(cache_key)
+            while len(self._file_info_cache) > FILE_INFO_CACHE_SIZE:
+                self._file_info_cache.popitem(last=False)
+
+    def _forget_file_info(self, key: str):
+        with self._file_info_lock:
+            self._file_info_cache.pop((self.bucket_name, key), None)
+
+    def open_object_stream(self, key: str) -> tuple[Any, int]:
+        """Open a streaming reader over an S3 object's body
+
+        Returns the body and the object's size. Raises S3NotFound if the
+        object does not exist. The caller must close the returned body.
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise S3NotFound(key) from e
+            raise
+        return response["Body"], response["ContentLength"]
+
+    def create_temp_download(
+        self,
+        key: str,
+        expected_size: int | None = None,
+    ) -> str | None:
+        """Download file to temporary location and return path
+
+        The file goes on tmpfs when there is room for `expected_size` bytes
+        (taken from the HEAD cache if not given); otherwise the system temp
+        dir. Raises S3NotFound if the object does not exist, so callers don't
+        need a separate HEAD request beforehand. Other failures return None.
+        """
+        if expected_size is None:
+            file_info = self._cached_file_info(key)
+            expected_size = file_info["size"] if file_info else 0
+
+        temp_path = None
+        try:
+            # Create temporary file; unknown sizes stay off tmpfs
+            fd, temp_path = tempfile.mkstemp(
+                dir=scratch_dir(expected_size) if expected_size else None,
+            )
+
+            # Download from S3 straight into the open descriptor
+            with os.fdopen(fd, "wb") as temp_file:
+                self.s3_client.download_fileobj(
+                    self.bucket_name,
+                    key,
+                    temp_file,
+                    Config=self._download_transfer_config,
+                )
+            logger.debug(f"Successfully downloaded file from S3: {key} -> {temp_path}")
+            return temp_path
+        except ClientError as e:
+            if temp_path:
+                self.cleanup_temp_file(temp_path)
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise S3NotFound(key) from e
+            logger.error(f"Failed to download file {key} from S3: {str(e)}")
+            return None
         except Exception as e:
+            if temp_path:
+                self.cleanup_temp_file(temp_path)
             logger.error(f"Failed to create temp download for {key}: {str(e)}")
             return None
 
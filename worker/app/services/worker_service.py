@@ -1,127 +1,388 @@
 import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from uuid import UUID
 from loguru import logger
 
 from app.models.entry import Entry, EntryStatus
-from app.services.database import AsyncSessionLocal
+from app.services.database import AsyncSessionLocal, listen_for_entry_changes
 from app.services.entry_service import EntryService
 from app.services.download_service import DownloadService
-from app.services.asr_service import ASRService
+from app.services.asr_service import ASRService, is_size_error
 from app.core.config import settings, WorkerMode
 
 
+@dataclass
+class StatusBatch:
+    """Entry status changes collected for one bulk write"""
+
+    statuses: list[tuple[UUID, EntryStatus, str | None]] = field(default_factory=list)
+    # entry id -> (file_path, filename) for entries that finished downloading
+    files: dict[UUID, tuple[str, str]] = field(default_factory=dict)
+
+    async def flush(self, entry_service: EntryService) -> bool:
+        """Write and clear the collected changes in one commit"""
+
+        ok = await entry_service.bulk_update_entry_statuses(self.statuses, self.files)
+        self.statuses.clear()
+        self.files.clear()
+        return ok
+
+
 class WorkerService:
     def __init__(self):
         self.download_service = DownloadService()
         self.asr_service = (
             ASRService() if settings.worker_mode == WorkerMode.ASR else None
         )
-        self.is_running = False
         self.mode = settings.worker_mode
+        # Set by stop(); every wait in the loop also returns when it is set
+        self._stop_event = asyncio.Event()
+        self._wakeup = asyncio.Event()
 
     async def start(self):
         """Start the worker processing loop"""
 
-        self.is_running = True
+        self._stop_event.clear()
         logger.info(f"Worker service started in {self.mode.value.upper()} mode")
 
-        while self.is_running:
-            try:
-                if self.mode == WorkerMode.DOWNLOAD:
-                    await self.process_download_entries()
-                elif self.mode == WorkerMode.ASR:
-                    await self.process_asr_entries()
+        listener = asyncio.create_task(self._listen_for_work())
+        if self.asr_service is not None:
+            await self.asr_service.warmup()
 
-                await asyncio.sleep(settings.worker_interval)
+        # Poll again soon after completing an entry; back off towards
+        # worker_interval while the queue is empty or every claimed entry
+        # failed, so a rate limit or outage isn't retried at full speed
+        interval = settings.worker_interval_min
 
-            except KeyboardInterrupt:
-                logger.info("Received shutdown signal")
-                break
-            except Exception as e:
-                logger.error(f"Error in worker loop: {str(e)}")
-                await asyncio.sleep(settings.worker_interval)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    completed = 0
+                    if self.mode == WorkerMode.DOWNLOAD:
+                        completed = await self.process_download_entries()
+                    elif self.mode == WorkerMode.ASR:
+                        completed = await self.process_asr_entries()
+
+                    if completed:
+                        interval = settings.worker_interval_min
+                    else:
+                        interval = min(
+                            interval * settings.worker_backoff_factor,
+                            settings.worker_interval,
+                        )
+                    await self._wait_for_work(interval)
+
+                except KeyboardInterrupt:
+                    logger.info("Received shutdown signal")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in worker loop: {str(e)}")
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            self._stop_event.wait(),
+                            timeout=settings.worker_interval,
+                        )
+        finally:
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
 
         logger.info("Worker service stopped")
 
-    def stop(self):
-        """Stop the worker processing loop"""
-        self.is_running = False
+    async def _listen_for_work(self):
+        """Subscribe to entry change notifications for this worker's mode
 
-    async def process_download_entries(self):
-        """Process entries for download (DOWNLOAD worker mode)"""
+        Runs until cancelled. While the listening connection is down the
+        worker falls back to polling, and reconnecting backs off from
+        worker_interval_min to worker_interval.
+        """
 
-        async with AsyncSessionLocal() as db:
-            entry_service = EntryService(db)
+        # Entries become work for the download worker as NEW and for the ASR
+        # worker as IN_PROGRESS
+        wake_status = (
+            EntryStatus.NEW
+            if self.mode == WorkerMode.DOWNLOAD
+            else EntryStatus.IN_PROGRESS
+        )
 
-            # Process URL entries that need downloading
-            url_entries = await entry_service.fetch_new_entries_for_download()
+        def on_entry_change(connection, pid, channel, payload):
+            if payload == wake_status.value:
+                self._wakeup.set()
 
-            # Move upload entries to IN_PROGRESS
-            await entry_service.fetch_new_uploads_for_processing()
+        delay = settings.worker_interval_min
+        while True:
+            lost = asyncio.Event()
+            try:
+                connection = await listen_for_entry_changes(
+                    on_entry_change,
+                    on_lost=lambda connection: lost.set(),
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Not listening for entry changes, retrying in {delay:.1f}s: {str(e)}",
+                )
+            else:
+                delay = settings.worker_interval_min
+                try:
+                    await self._watch_listener(connection, lost)
+                finally:
+                    # Closing a dead connection can fail; it's gone either way
+                    with contextlib.suppress(Exception):
+                        await connection.close(timeout=5)
+                logger.warning(
+                    "Lost the entry change listener connection, reconnecting",
+                )
+                # Changes made while disconnected were never notified
+                self._wakeup.set()
 
-            if not url_entries:
-                logger.debug("No URL entries to download")
-                return
+            await asyncio.sleep(delay)
+            delay = min(
+                delay * settings.worker_backoff_factor,
+                settings.worker_interval,
+            )
 
-            logger.info(f"Processing {len(url_entries)} URL entries for download")
+    async def _watch_listener(self, connection, lost: asyncio.Event):
+        """Return once the listening connection is closed or stops answering
 
-            # Process each entry
-            for entry in url_entries:
-                await self.process_download_entry(entry, entry_service)
+        A dropped network path doesn't always close the socket, so the
+        connection is also pinged every worker_interval seconds.
+        """
 
-    async def process_asr_entries(self):
-        """Process entries for ASR (ASR worker mode)"""
+        while True:
+            try:
+                await asyncio.wait_for(lost.wait(), timeout=settings.worker_interval)
+                return
+            except TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(
+                    connection.fetchval("SELECT 1"),
+                    timeout=settings.worker_interval,
+                )
+            except Exception:
+                return
 
-        async with AsyncSessionLocal() as db:
-            entry_service = EntryService(db)
+    async def _wait_for_work(self, timeout: float):
+        """Sleep until an entry changes or timeout seconds pass"""
 
-            # Fetch IN_PROGRESS entries for ASR
-            in_progress_entries = await entry_service.fetch_in_progress_entries()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except TimeoutError:
+            pass
+        # Changes that arrive while the next batch is processed set the
+        # event again, so none are missed
+        self._wakeup.clear()
 
-            if not in_progress_entries:
-                logger.debug("No IN_PROGRESS entries for ASR")
-                return
+    def stop(self):
+        """Stop the worker processing loop, interrupting any idle wait"""
+        self._stop_event.set()
+        self._wakeup.set()
 
-            logger.info(f"Processing {len(in_progress_entries)} entries for ASR")
+    async def process_download_entries(self) -> int:
+        """Process entries for download (DOWNLOAD worker mode)
 
-            # Process each entry
-            for entry in in_progress_entries:
-                await self.process_asr_entry(entry, entry_service)
+        Returns the number of entries handed on to ASR: claimed uploads plus
+        URL entries that downloaded successfully.
+        """
 
-    async def process_download_entry(self, entry: Entry, entry_service: EntryService):
-        """Process a single entry for download"""
+        async with AsyncSessionLocal() as db:
+            entry_service = EntryService(db)
 
-        logger.info(f"Downloading entry {entry.id}: {entry.title}")
+            # Claim URL entries that need downloading and move upload entries
+            # straight to IN_PROGRESS, in one round trip
+            url_entries, uploads = await entry_service.claim_download_batch()
 
-        try:
-            # Mark entry as in progress
-            await entry_service.update_entry_status(entry.id, EntryStatus.IN_PROGRESS)
+            if not url_entries:
+                logger.debug("No URL entries to download")
+                return len(uploads)
 
-            # Download from URL
-            success = await self.process_url_download(entry, entry_service)
+            logger.info(f"Processing {len(url_entries)} URL entries for download")
 
-            if success:
-                logger.info(f"Successfully downloaded entry {entry.id}")
-            else:
-                logger.warning(
-                    f"Failed to download entry {entry.id} from URL: {entry.source_url}",
-                )
+            downloaded = await self.run_download_pipeline(url_entries, entry_service)
+            return downloaded + len(uploads)
 
-        except Exception as e:
-            error_msg = f"Error downloading entry {entry.id}: {str(e)}"
-            logger.error(error_msg)
+    async def run_download_pipeline(
+        self,
+        entries: list[Entry],
+        entry_service: EntryService,
+    ) -> int:
+        """Download, convert/upload, and record a batch as overlapping stages
+
+        While one entry is being converted and uploaded, the next ones are
+        already downloading. Stages are connected by bounded queues so fast
+        downloads can't pile up unconverted files on disk. All database
+        writes happen in the single recording stage, since the stages share
+        one session. Returns the number of entries downloaded successfully.
+        """
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for entry in entries:
+            pending.put_nowait(entry)
+        downloaded: asyncio.Queue = asyncio.Queue(maxsize=2)
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async def downloader():
+            while not pending.empty():
+                entry = pending.get_nowait()
+                logger.info(f"Downloading entry {entry.id}: {entry.title}")
+                try:
+                    if not entry.source_url:
+                        result = (False, None, "Missing source URL")
+                    elif self.download_service.is_streamable_url(entry.source_url):
+                        # Streamed straight to S3 by the converter stage
+                        result = None
+                    else:
+                        logger.info(f"Downloading from URL: {entry.source_url}")
+                        result = await self.download_service.download_to_local(
+                            entry.source_url,
+                            str(entry.id),
+                        )
+                except Exception as e:
+                    result = (False, None, f"Error downloading entry {entry.id}: {e}")
+                await downloaded.put((entry, result))
+
+        async def converter():
+            while (item := await downloaded.get()) is not None:
+                entry, result = item
+                try:
+                    if result is None:
+                        result = await self.download_service.download_from_url(
+                            entry.source_url,
+                            str(entry.id),
+                        )
+                    elif result[0] and result[1]:
+                        result = await self.download_service.convert_and_upload(
+                            result[1],
+                            str(entry.id),
+                        )
+                except Exception as e:
+                    result = (False, None, f"Error downloading entry {entry.id}: {e}")
+                await finished.put((entry, result))
+
+        async def recorder():
+            # Write whatever results are ready in one statement, so entries
+            # finishing together cost one round trip without holding back
+            # an entry that finishes alone
+            batch = StatusBatch()
+            succeeded = 0
+            done = False
+            while not done:
+                items = [await finished.get()]
+                while not finished.empty():
+                    items.append(finished.get_nowait())
+                for item in items:
+                    if item is None:
+                        done = True
+                        continue
+                    entry, (success, result, error_msg) = item
+                    succeeded += await self.record_download_result(
+                        entry,
+                        success,
+                        result,
+                        error_msg,
+                        batch,
+                    )
+                await batch.flush(entry_service)
+            return succeeded
+
+        recording = asyncio.create_task(recorder())
+        converters = [
+            asyncio.create_task(converter())
+            for _ in range(min(settings.ffmpeg_concurrency, len(entries)))
+        ]
+        await asyncio.gather(
+            *(
+                downloader()
+                for _ in range(min(settings.download_concurrency, len(entries)))
+            ),
+        )
+        for _ in converters:
+            await downloaded.put(None)
+        await asyncio.gather(*converters)
+        await finished.put(None)
+        return await recording
+
+    async def process_asr_entries(self) -> int:
+        """Process entries for ASR (ASR worker mode)
+
+        Keeps up to worker_concurrency entries transcribing at once and
+        fetches more as soon as any one finishes, instead of waiting for the
+        slowest entry of a batch. Up to asr_prefetch further entries are
+        downloaded and validated while every slot is busy, so the next
+        transcription starts without waiting on S3. Returns the number of
+        entries transcribed successfully once nothing is left to do.
+        """
+
+        concurrency = max(1, settings.worker_concurrency)
+        transcribe_slots = asyncio.Semaphore(concurrency)
+        in_flight: dict[asyncio.Task, Entry] = {}
+        # Every entry started in this pass, finished or not; one that failed
+        # must wait for the next poll rather than be refetched straight away
+        attempted: set[UUID] = set()
+        completed = 0
+
+        async def process(entry: Entry) -> bool:
+            # AsyncSession isn't safe for concurrent use; each entry gets its own
+            async with AsyncSessionLocal() as entry_db:
+                return await self.process_asr_entry(
+                    entry,
+                    EntryService(entry_db),
+                    transcribe_slots,
+                )
 
-            # Mark entry as NEW with error message for retry
-            await entry_service.update_entry_status(
-                entry.id,
-                EntryStatus.NEW,
-                error_message=error_msg,
+        while True:
+            free_slots = concurrency + max(0, settings.asr_prefetch) - len(in_flight)
+            if free_slots > 0 and not self._stop_event.is_set():
+                async with AsyncSessionLocal() as db:
+                    entries = await EntryService(db).fetch_in_progress_entries(
+                        limit=free_slots,
+                        exclude_ids=attempted,
+                    )
+                    # End the fetch transaction so its row locks don't block
+                    # the per-entry sessions
+                    await db.commit()
+
+                if entries:
+                    logger.info(f"Processing {len(entries)} entries for ASR")
+                for entry in entries:
+                    in_flight[asyncio.create_task(process(entry))] = entry
+                    attempted.add(entry.id)
+
+            if not in_flight:
+                if not attempted:
+                    logger.debug("No IN_PROGRESS entries for ASR")
+                return completed
+
+            done, _ = await asyncio.wait(
+                in_flight,
+                return_when=asyncio.FIRST_COMPLETED,
             )
+            for task in done:
+                entry = in_flight.pop(task)
+                if task.exception() is not None:
+                    logger.error(
+                        f"Error transcribing entry {entry.id}: {str(task.exception())}",
+                    )
+                elif task.result():
+                    completed += 1
+
+    async def process_asr_entry(
+        self,
+        entry: Entry,
+        entry_service: EntryService,
+        transcribe_slots: asyncio.Semaphore | None = None,
+    ) -> bool:
+        """Process a single entry for ASR
 
-    async def process_asr_entry(self, entry: Entry, entry_service: EntryService):
-        """Process a single entry for ASR"""
+        The audio is fetched and validated straight away; the transcription
+        itself waits for one of `transcribe_slots` when given. Returns whether
+        the transcript was saved.
+        """
 
         logger.info(f"Transcribing entry {entry.id}: {entry.title}")
 
+        local_path = None
         try:
             if not entry.file_path:
                 error_msg = "No file path available for transcription"
@@ -130,43 +391,25 @@ class WorkerService:
                     EntryStatus.ERROR,
                     error_message=error_msg,
                 )
-                return
+                return False
+
+            # Download the audio once; validation and transcription both work
+            # from the local copy instead of going back to S3
+            local_path, file_info = await self.asr_service.fetch_audio_file(
+                entry.file_path,
+            )
 
             # Validate file before transcription (file_path now contains S3 key)
             try:
-                is_valid, validation_error = self.asr_service.validate_audio_file(
+                # Falls back to a blocking S3 HEAD if the download failed
+                is_valid, validation_error = await asyncio.to_thread(
+                    self.asr_service.validate_audio_file,
                     entry.file_path,
+                    file_info,
                 )
                 if not is_valid:
                     # Check if this is a size-related error that chunking can handle
-                    size_related_keywords = [
-                        "too large",
-                        "file size",
-                        "groq processing",
-                        "max:",
-                        "bytes",
-                        "exceeds",
-                        "file too large for groq",
-                        "26214400",
-                        "34046591",
-                        "47700599",
-                        "file too large for groq processing",
-                        "(max:",
-                        "file too large for upload",
-                        "file too large for conversion",
-                        "size exceeds",
-                        "file size exceeds",
-                        "file size limit",
-                        "size limit",
-                        "large file",
-                        "chunk",
-                    ]
-                    is_size_error = validation_error and any(
-                        keyword in validation_error.lower()
-                        for keyword in size_related_keywords
-                    )
-
-                    if is_size_error:
+                    if is_size_error(validation_error):
                         logger.info(
                             f"Entry {entry.id}: Large file detected, will use chunking for processing: {validation_error}",
                         )
@@ -184,7 +427,7 @@ class WorkerService:
                             EntryStatus.ERROR,
                             error_message=f"File validation failed: {validation_error}",
                         )
-                        return
+                        return False
             except Exception as e:
                 logger.error(f"Error validating file for entry {entry.id}: {str(e)}")
                 await entry_service.update_entry_status(
@@ -192,28 +435,35 @@ class WorkerService:
                     EntryStatus.ERROR,
                     error_message=f"File validation error: {str(e)}",
                 )
-                return
+                return False
 
             # Perform transcription (file_path contains S3 key)
-            logger.info(f"Entry {entry.id}: Starting transcription process")
-            (
+            async with transcribe_slots or contextlib.nullcontext():
+                logger.info(f"Entry {entry.id}: Starting transcription process")
+                (
+                    success,
+                    transcript,
+                    words,
+                    segments,
+                    error_msg,
+                ) = await self.asr_service.transcribe_file(
+                    entry.file_path,
+                    str(entry.id),
+                    language=getattr(entry, "language", None) or None,
+                    local_path=local_path,
+                )
+
+            # Debug logging to see what's returned; loguru only formats the
+            # message if a sink accepts DEBUG
+            logger.debug(
+                "Entry {}: Transcription result - success: {}, transcript_length: {}, "
+                "words: {}, segments: {}, error: {}",
+                entry.id,
                 success,
-                transcript,
-                words,
-                segments,
+                len(transcript) if transcript else 0,
+                len(words) if words else 0,
+                len(segments) if segments else 0,
                 error_msg,
-            ) = await self.asr_service.transcribe_file(
-                entry.file_path,
-                str(entry.id),
-                language=getattr(entry, "language", None) or None,
-            )
-
-            # Debug logging to see what's returned
-            logger.info(
-                f"Entry {entry.id}: Transcription result - success: {success}, "
-                f"transcript_length: {len(transcript) if transcript else 0}, "
-                f"words: {len(words) if words else 0}, "
-                f"segments: {len(segments) if segments else 0}, error: {error_msg}",
             )
 
             if success and transcript:
@@ -228,6 +478,7 @@ class WorkerService:
                     segments,
                 )
                 logger.info(f"Successfully transcribed entry {entry.id}")
+                return True
             else:
                 # Debug why transcription failed
                 if not success:
@@ -280,42 +531,30 @@ class WorkerService:
                     EntryStatus.NEW,
                     error_message=error_msg,
                 )
+        finally:
+            if local_path:
+                self.asr_service.s3_service.cleanup_temp_file(local_path)
+
+        return False
 
-    async def process_url_download(
+    async def record_download_result(
         self,
         entry: Entry,
-        entry_service: EntryService,
+        success: bool,
+        result: tuple[str, str] | None,
+        error_msg: str | None,
+        batch: StatusBatch,
     ) -> bool:
-        """Process URL entry by downloading the content"""
-
-        if not entry.source_url:
-            await entry_service.update_entry_status(
-                entry.id,
-                EntryStatus.NEW,
-                error_message="Missing source URL",
-            )
-            return False
-
-        logger.info(f"Downloading from URL: {entry.source_url}")
-
-        # Download the file
-        success, result, error_msg = await self.download_service.download_from_url(
-            entry.source_url,
-            str(entry.id),
-        )
+        """Add a download outcome to batch: file path and status, or the error"""
 
         if success and result:
             # result is now (s3_key, filename) tuple
             s3_key, filename = result
 
-            # Update entry with S3 key as file path and filename
-            await entry_service.update_entry_file_path(entry.id, s3_key, filename)
-
-            # Mark as IN_PROGRESS for ASR processing (not READY)
-            await entry_service.update_entry_status(
-                entry.id,
-                EntryStatus.IN_PROGRESS,
-            )
+            # Store the S3 key and filename and mark as IN_PROGRESS for ASR
+            # processing (not READY)
+            batch.statuses.append((entry.id, EntryStatus.IN_PROGRESS, None))
+            batch.files[entry.id] = (s3_key, filename)
 
             logger.info(
                 f"Entry {entry.id} download completed and uploaded to S3: {s3_key}",
@@ -329,36 +568,42 @@ class WorkerService:
                 if self.download_service.is_youtube_auth_error(error_msg):
                     # YouTube auth error - provide helpful message but mark as ERROR
                     friendly_msg = "YouTube requires authentication. This video may be age-restricted or require sign-in. Please try a different video or contact administrator to configure authentication."
-                    await entry_service.update_entry_status(
-                        entry.id,
-                        EntryStatus.ERROR,
-                        error_message=friendly_msg,
+                    batch.statuses.append(
+                        (entry.id, EntryStatus.ERROR, friendly_msg),
                     )
                     logger.warning(
                         f"Entry {entry.id} YouTube authentication required: {error_msg}",
                     )
                 else:
                     # Other permanent error
-                    await entry_service.update_entry_status(
-                        entry.id,
-                        EntryStatus.ERROR,
-                        error_message=error_msg or "Download failed (permanent error)",
+                    batch.statuses.append(
+                        (
+                            entry.id,
+                            EntryStatus.ERROR,
+                            error_msg or "Download failed (permanent error)",
+                        ),
                     )
                     logger.error(
                         f"Entry {entry.id} permanent download error: {error_msg}",
                     )
             else:
                 # Temporary error - mark as NEW for retry
-                await entry_service.update_entry_status(
-                    entry.id,
-                    EntryStatus.NEW,
-                    error_message=error_msg or "Download failed (will retry)",
+                batch.statuses.append(
+                    (
+                        entry.id,
+                        EntryStatus.NEW,
+                        error_msg or "Download failed (will retry)",
+                    ),
                 )
                 logger.warning(
                     f"Entry {entry.id} temporary download error: {error_msg}",
                 )
 
-            # Clean up any partial downloads (local files only, S3 cleanup handled in download service)
-            self.download_service.cleanup_failed_download(str(entry.id))
+            # Clean up any partial downloads (local files only, S3 cleanup handled in download service).
+            # Scanning download_dir is blocking I/O, so keep it off the loop
+            await asyncio.to_thread(
+                self.download_service.cleanup_failed_download,
+                str(entry.id),
+            )
 
             return False
@@ -0,0 +1,88 @@
+import io
+import sys
+import wave
+from pathlib import Path
+from unittest import TestCase
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.services.audio_conversion_service import (
+    _id3v2_tag_size,
+    _looks_like_mp3,
+    _probe_mp3_params,
+    _sniff_channels,
+)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+
+
+def id3_tag(payload_size):
+    size = bytes(
+        [
+            (payload_size >> 21) & 0x7F,
+            (payload_size >> 14) & 0x7F,
+            (payload_size >> 7) & 0x7F,
+            payload_size & 0x7F,
+        ],
+    )
+    return b"ID3\x04\x00\x00" + size + b"\x00" * payload_size
+
+
+class Mp3HeaderTests(TestCase):
+    def test_accepts_bare_frame(self):
+        self.assertTrue(_looks_like_mp3(FRAME_HEADER + b"\x00" * 100))
+
+    def test_skips_id3_tag(self):
+        self.assertEqual(_id3v2_tag_size(id3_tag(300)), 310)
+        self.assertTrue(_looks_like_mp3(id3_tag(300) + FRAME_HEADER))
+
+    def test_rejects_reserved_bits(self):
+        # bitrate index 0xF is invalid
+        self.assertFalse(_looks_like_mp3(bytes([0xFF, 0xFB, 0xF0, 0x64])))
+        # sample rate index 3 is reserved
+        self.assertFalse(_looks_like_mp3(bytes([0xFF, 0xFB, 0x9C, 0x64])))
+
+    def test_rejects_other_formats(self):
+        self.assertFalse(_looks_like_mp3(b"RIFF\x24\x08\x00\x00WAVEfmt "))
+        self.assertFalse(_looks_like_mp3(b""))
+
+    def test_reads_past_large_tag(self):
+        tag = id3_tag(5000)
+        self.assertTrue(_looks_like_mp3(tag + FRAME_HEADER + b"\x00" * 400))
+        self.assertFalse(_looks_like_mp3(tag + b"\x00" * 400))
+
+
+class ChannelSniffTests(TestCase):
+    def make_wav(self, channels):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(b"\x00\x00" * channels * 1600)
+        return buffer.getvalue()
+
+    def test_wav_channels(self):
+        self.assertEqual(_sniff_channels(self.make_wav(1)), 1)
+        self.assertEqual(_sniff_channels(self.make_wav(2)), 2)
+
+    def test_mp3_channel_mode(self):
+        mono_header = FRAME_HEADER[:3] + bytes([0xC4])
+        self.assertEqual(_sniff_channels(id3_tag(20) + mono_header), 1)
+        self.assertEqual(_sniff_channels(FRAME_HEADER), 2)
+
+    def test_unknown_format(self):
+        self.assertIsNone(_sniff_channels(b"\x00\x00\x00\x20ftypM4A "))
+
+
+class Mp3ParamsTests(TestCase):
+    def test_probe_cbr_frame(self):
+        self.assertEqual(
+            _probe_mp3_params(FRAME_HEADER + b"\x00" * 60),
+            (128, 44100, 2),
+        )
+
+    def test_probe_skips_vbr(self):
+        frame = FRAME_HEADER + b"\x00" * 32 + b"Xing" + b"\x00" * 24
+        self.assertIsNone(_probe_mp3_params(frame))